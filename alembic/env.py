@@ -8,7 +8,7 @@ from alembic import context
 # Importar configuración y modelos
 from app.core.config import settings
 from app.core.database import Base
-from app.models.models import User, Task  # Importar TODOS los modelos
+from app.models.models import User, Task, TaskCategoryCount, UserDataVersion  # Importar TODOS los modelos
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,62 @@
+"""Add full-text search vector to tasks
+
+Revision ID: 3f1c9a7d2e4b
+Revises: 8b5760b2d6dd
+Create Date: 2026-10-18 09:00:00.000000
+
+Operational cost: adding a STORED generated column rewrites the whole tasks
+table under an ACCESS EXCLUSIVE lock (no reads or writes until it ends, and
+it needs disk for a second copy of the table), so on a large table run it in
+a maintenance window. The GIN index is then built CONCURRENTLY, outside the
+migration transaction, and does not block writes.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c9a7d2e4b'
+down_revision = '8b5760b2d6dd'
+branch_labels = None
+depends_on = None
+
+
+# Español (con stemming) + simple (palabras exactas: nombres, códigos, siglas).
+# El título pesa más (A) que la descripción (B) en el ranking.
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('spanish', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('spanish', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Columna generada (PostgreSQL 12+): se mantiene sola en cada INSERT/UPDATE.
+    # Reescribe la tabla bloqueándola (ACCESS EXCLUSIVE) durante toda la reescritura
+    op.add_column('tasks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR_SQL, persisted=True),
+        nullable=True
+    ))
+    
+    # CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_search_vector',
+            'tasks',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_search_vector', table_name='tasks', postgresql_concurrently=True, if_exists=True)
+    op.drop_column('tasks', 'search_vector')
@@ -0,0 +1,46 @@
+"""Add per-user composite indexes on tasks
+
+Revision ID: 7a2d4c8e1b90
+Revises: 3f1c9a7d2e4b
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '7a2d4c8e1b90'
+down_revision = '3f1c9a7d2e4b'
+branch_labels = None
+depends_on = None
+
+
+# Todas las consultas de app/api/tasks.py filtran por user_id y luego filtran
+# u ordenan por otra columna; id es el desempate de la paginación keyset
+COMPOSITE_INDEXES = [
+    ('ix_tasks_user_id_created_at', ['user_id', 'created_at', 'id']),
+    ('ix_tasks_user_id_start_date', ['user_id', 'start_date', 'id']),
+    ('ix_tasks_user_id_deadline', ['user_id', 'deadline', 'id']),
+    ('ix_tasks_user_id_status', ['user_id', 'status', 'id']),
+    ('ix_tasks_user_id_category', ['user_id', 'category']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY no puede correr dentro de una transacción
+    with op.get_context().autocommit_block():
+        for name, columns in COMPOSITE_INDEXES:
+            op.create_index(name, 'tasks', columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+        
+        # Redundantes con la clave primaria
+        op.drop_index('ix_tasks_id', table_name='tasks', postgresql_concurrently=True, if_exists=True)
+        op.drop_index('ix_users_id', table_name='users', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_users_id', 'users', ['id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.create_index('ix_tasks_id', 'tasks', ['id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        
+        for name, _ in reversed(COMPOSITE_INDEXES):
+            op.drop_index(name, table_name='tasks', postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,40 @@
+"""Add task_category_counts summary table
+
+Revision ID: c41e7b9a2f63
+Revises: 7a2d4c8e1b90
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41e7b9a2f63'
+down_revision = '7a2d4c8e1b90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('task_category_counts',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category', sa.String(length=100), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'category')
+    )
+
+    # Carga inicial desde las tareas existentes; a partir de aquí los contadores
+    # se mantienen en cada escritura (python -m scripts.rebuild_category_counts
+    # los recalcula si se desincronizan)
+    op.execute(
+        "INSERT INTO task_category_counts (user_id, category, count) "
+        "SELECT user_id, category, count(*) FROM tasks "
+        "WHERE category IS NOT NULL AND category <> '' "
+        "GROUP BY user_id, category"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_category_counts')
@@ -0,0 +1,30 @@
+"""Add user_data_versions table
+
+Revision ID: 5d8f2a6c9e17
+Revises: c41e7b9a2f63
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d8f2a6c9e17'
+down_revision = 'c41e7b9a2f63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Sin carga inicial: un usuario sin fila está en la versión 0
+    op.create_table('user_data_versions',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('user_data_versions')
@@ -0,0 +1,31 @@
+"""Add tasks.completed_at
+
+Revision ID: 9b3e5f1d7c24
+Revises: 5d8f2a6c9e17
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3e5f1d7c24'
+down_revision = '5d8f2a6c9e17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('tasks', sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True))
+
+    # Las tareas ya completadas no guardaron cuándo: se toma su última
+    # modificación (o la creación) como aproximación
+    op.execute(
+        "UPDATE tasks SET completed_at = coalesce(updated_at, created_at) "
+        "WHERE status = 'completado'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'completed_at')
@@ -1,8 +1,11 @@
+from typing import Optional
+
 from fastapi import APIRouter, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import get_password_hash, verify_password
+from app.core.security import get_password_hash_async, verify_password_async
 from app.core.jwt import create_access_token, create_refresh_token, verify_refresh_token
 from app.core.exceptions import BadRequestException, UnauthorizedException, ConflictException
 from app.core.response import success_response
@@ -11,27 +14,39 @@ from app.schemas.schemas import UserCreate, UserResponse, LoginRequest, TokenRes
 
 router = APIRouter()
 
+# register y login son async: bcrypt corre en su propio pool acotado y se
+# espera sin bloquear un hilo; solo las consultas pasan por el threadpool
+# (que comparten todas las rutas de tareas)
+
+
+def find_user_by_email(db: Session, email: str) -> Optional[User]:
+    return db.query(User).filter(User.email == email).first()
+
+
+def save_user(db: Session, user: User) -> None:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+
 
 @router.post("/register", status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user"""
     
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = await run_in_threadpool(find_user_by_email, db, user_data.email)
     if existing_user:
         raise ConflictException(message="El correo electrónico ya está registrado")
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         name=user_data.name,
         email=user_data.email,
         hashed_password=hashed_password
     )
     
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await run_in_threadpool(save_user, db, new_user)
     
     user_response = UserResponse.model_validate(new_user)
     
@@ -42,13 +57,13 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login")
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     """Login user and return access and refresh tokens with user data"""
     
     # Find user by email
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = await run_in_threadpool(find_user_by_email, db, login_data.email)
     
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
         raise UnauthorizedException(message="Correo electrónico o contraseña incorrectos")
     
     # Create tokens (sub debe ser string)
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_db
+from app.core.security import get_password_hash_async, verify_password_async
+from app.core.jwt import create_access_token, create_refresh_token, verify_refresh_token
+from app.core.exceptions import UnauthorizedException, ConflictException
+from app.core.response import success_response
+from app.models.models import User
+from app.schemas.schemas import UserCreate, UserResponse, LoginRequest, LoginResponse, RefreshTokenRequest
+
+# Versión async de app/api/auth.py (ASYNC_DATABASE=true)
+
+router = APIRouter()
+
+
+@router.post("/register", status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """Register a new user"""
+    
+    # Check if user already exists
+    existing_user = await db.scalar(select(User).where(User.email == user_data.email))
+    if existing_user:
+        raise ConflictException(message="El correo electrónico ya está registrado")
+    
+    # Create new user (bcrypt corre en su propio pool acotado, fuera del event loop)
+    hashed_password = await get_password_hash_async(user_data.password)
+    new_user = User(
+        name=user_data.name,
+        email=user_data.email,
+        hashed_password=hashed_password
+    )
+    
+    db.add(new_user)
+    await db.commit()
+    await db.refresh(new_user)
+    
+    user_response = UserResponse.model_validate(new_user)
+    
+    return success_response(
+        message="Usuario registrado exitosamente",
+        data=user_response.model_dump()
+    )
+
+
+@router.post("/login")
+async def login(login_data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    """Login user and return access and refresh tokens with user data"""
+    
+    # Find user by email
+    user = await db.scalar(select(User).where(User.email == login_data.email))
+    
+    if not user or not await verify_password_async(login_data.password, user.hashed_password):
+        raise UnauthorizedException(message="Correo electrónico o contraseña incorrectos")
+    
+    # Create tokens (sub debe ser string)
+    access_token = create_access_token(data={"sub": str(user.id)})
+    refresh_token = create_refresh_token(data={"sub": str(user.id)})
+    
+    # Prepare user data
+    user_data = {
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "created_at": user.created_at.isoformat() if user.created_at else None
+    }
+    
+    login_response = LoginResponse(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        user=user_data
+    )
+    
+    return success_response(
+        message="Inicio de sesión exitoso",
+        data=login_response.model_dump()
+    )
+
+
+@router.post("/refresh")
+async def refresh_token(token_data: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
+    """Refresh access token using refresh token"""
+    
+    # Verify refresh token
+    payload = verify_refresh_token(token_data.refresh_token)
+    user_id = payload.get("sub")
+    
+    if not user_id:
+        raise UnauthorizedException(message="Token inválido")
+    
+    # Verify user exists (convertir user_id a int si es string)
+    user_id_int = int(user_id) if isinstance(user_id, str) else user_id
+    user = await db.get(User, user_id_int)
+    if not user:
+        raise UnauthorizedException(message="Usuario no encontrado")
+    
+    # Create new access token (sub debe ser string)
+    access_token = create_access_token(data={"sub": str(user.id)})
+    
+    return success_response(
+        message="Token renovado exitosamente",
+        data={"access_token": access_token, "token_type": "bearer"}
+    )
@@ -3,7 +3,8 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
 from app.core.database import get_db
-from app.core.jwt import get_current_user, decode_token
+from app.core.internal import require_internal_token
+from app.core.jwt import AuthenticatedUser, get_current_user, decode_token
 from app.core.response import success_response
 from app.models.models import User
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -80,7 +81,7 @@ def debug_token(
 
 
 @router.get("/debug/me")
-def debug_me(current_user: User = Depends(get_current_user)):
+def debug_me(current_user: AuthenticatedUser = Depends(get_current_user)):
     """Endpoint de debug que usa get_current_user"""
     return success_response(
         message="Usuario autenticado correctamente",
@@ -106,3 +107,56 @@ def debug_config():
             "secret_key_length": len(settings.SECRET_KEY)
         }
     )
+
+
+@router.get("/debug/cache", dependencies=[Depends(require_internal_token)])
+def debug_cache():
+    """Ver estadísticas de los caches en memoria (hit rate)"""
+    from app.core.read_routing import routing_stats
+    from app.core.jwt import user_cache, token_cache
+    from app.services.tasks import calendar_cache, task_list_cache
+    
+    return success_response(
+        message="Estadísticas de cache",
+        data={
+            "user_cache": user_cache.stats(),
+            "token_cache": token_cache.stats(),
+            "calendar_cache": calendar_cache.stats(),
+            "task_list_cache": task_list_cache.stats(),
+            "read_routing": routing_stats()
+        }
+    )
+
+
+@router.get("/debug/pool", dependencies=[Depends(require_internal_token)])
+def debug_pool():
+    """Ver el estado de los pools de conexiones (en uso, overflow, espera, timeouts)"""
+    from app.core import database
+    from app.core.db_pool import pool_stats
+    
+    engines = {
+        "primary": database.engine,
+        "replica": database.replica_engine,
+        "async_primary": database.async_engine,
+        "async_replica": database.async_replica_engine
+    }
+    
+    return success_response(
+        message="Estadísticas del pool de conexiones",
+        data={
+            name: pool_stats(engine.pool)
+            for name, engine in engines.items()
+            if engine is not None
+        }
+    )
+
+
+@router.get("/debug/admission", dependencies=[Depends(require_internal_token)])
+def debug_admission():
+    """Ver el control de admisión por clase de ruta (en curso, en cola, rechazos)"""
+    from app.core.admission import admission
+    
+    return success_response(
+        message="Estadísticas del control de admisión",
+        data=admission.stats()
+    )
@@ -1,61 +1,117 @@
-from fastapi import APIRouter, Depends, status, Query
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, asc, func, extract
-from typing import List, Optional
-from datetime import datetime
-from calendar import monthrange
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.jwt import get_current_user
-from app.core.exceptions import NotFoundException, ForbiddenException, BadRequestException
-from app.core.response import success_response
-from app.models.models import User, Task
-from app.schemas.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskBulkCreate, CategoryResponse, TaskStatus
+from app.core.etag import check_not_modified, make_etag
+from app.core.jwt import AuthenticatedUser, get_current_user
+from app.core.read_routing import get_read_db, routed_data_version
+from app.core.response import json_response, raw_json_response, success_response
+from app.schemas.schemas import TaskCreate, TaskUpdate, TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete
+from app.services import tasks as task_service
+from app.services import task_import
+from app.services.task_import import import_format
+from app.services.tasks import TaskListParams, task_response_dict
 
 router = APIRouter()
 
 
+def task_data_version(
+    request: Request,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+) -> int:
+    """
+    Conditional GET for task reads: the ETag is the user's data version
+    (bumped by every task write), so a matching If-None-Match is answered
+    with an empty 304 before any task query runs. Returns the version
+    (already read by the replica routing when there is a replica).
+    """
+    version = routed_data_version(request)
+    if version is None:
+        version = task_service.data_version(db, current_user.id)
+    check_not_modified(request, response, make_etag(current_user.id, version))
+    return version
+
+
+def task_list_params(
+    params: TaskListParams = Depends(),
+    db: Session = Depends(get_read_db)
+) -> TaskListParams:
+    """GET /tasks parameters with `fields` and `cursor` validated"""
+    task_service.validate_task_list_params(db, params)
+    return params
+
+
+def task_list_version(
+    request: Request,
+    response: Response,
+    params: TaskListParams = Depends(task_list_params),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+) -> int:
+    """task_data_version for GET /tasks, once its parameters are valid (a bad request is a 400, never a 304)"""
+    return task_data_version(request, response, current_user, db)
+
+
+def calendar_fields(
+    year: int,
+    month: int,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas, ej: id,title,status,deadline (por defecto todos)")
+) -> Optional[str]:
+    """`fields` of a calendar request, with it and the month validated"""
+    task_service.validate_calendar_month(year, month)
+    task_service.response_fields(fields)
+    return fields
+
+
+def calendar_version(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Depends(calendar_fields),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+) -> int:
+    """task_data_version for the calendar, once the month and fields are valid"""
+    return task_data_version(request, response, current_user, db)
+
+
 @router.post("/", status_code=status.HTTP_201_CREATED)
 def create_task(
     task_data: TaskCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new task"""
     
-    new_task = Task(
-        title=task_data.title,
-        description=task_data.description,
-        category=task_data.category,
-        status=task_data.status.value,
-        start_date=task_data.start_date,
-        deadline=task_data.deadline,
-        user_id=current_user.id
-    )
-    
-    db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    new_task = task_service.create_task(db, current_user.id, task_data)
+    task_service.task_list_cache.invalidate(current_user.id)
     
-    task_response = TaskResponse.model_validate(new_task)
-    
-    return success_response(
+    return json_response(success_response(
         message="Tarea creada exitosamente",
-        data=task_response.model_dump()
-    )
+        data=task_response_dict(new_task)
+    ), status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/bulk", status_code=status.HTTP_201_CREATED)
 def create_tasks_bulk(
     bulk_data: TaskBulkCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Create multiple tasks at once
     
-    **Note:** This endpoint accepts JSON only. CSV files are NOT directly supported.
-    If you want to import from CSV, parse it on the client-side and send as JSON array.
+    **Note:** This endpoint accepts JSON only. To import CSV or NDJSON files,
+    stream them to `POST /tasks/import` instead.
+    
+    Tasks are inserted with multi-row `INSERT ... RETURNING` statements and
+    committed in chunks of `TASKS_BULK_CHUNK_SIZE`; if a later chunk fails,
+    the chunks already committed are kept.
     
     Example request body:
     ```json
@@ -82,283 +138,281 @@ def create_tasks_bulk(
     ```
     """
     
-    if len(bulk_data.tasks) == 0:
-        raise BadRequestException(message="Debe proporcionar al menos una tarea")
+    new_tasks = task_service.create_tasks(db, current_user.id, bulk_data.tasks)
+    task_service.task_list_cache.invalidate(current_user.id)
     
-    new_tasks = []
-    for task_data in bulk_data.tasks:
-        new_task = Task(
-            title=task_data.title,
-            description=task_data.description,
-            category=task_data.category,
-            status=task_data.status.value,
-            start_date=task_data.start_date,
-            deadline=task_data.deadline,
-            user_id=current_user.id
-        )
-        new_tasks.append(new_task)
+    tasks_response = [task_response_dict(task) for task in new_tasks]
     
-    db.add_all(new_tasks)
-    db.commit()
+    return json_response(success_response(
+        message=f"{len(new_tasks)} tareas creadas exitosamente",
+        data=tasks_response
+    ), status_code=status.HTTP_201_CREATED)
+
+
+@router.patch("/bulk")
+def update_tasks_bulk(
+    bulk_data: TaskBulkUpdate,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Update many tasks at once
     
-    # Refresh all tasks to get their IDs
-    for task in new_tasks:
-        db.refresh(task)
+    Select the tasks with `ids` **or** with `filter` (same filters as `GET /tasks`;
+    `{}` selects all of them) and send the fields to change in `changes`. The
+    change runs as a single `UPDATE ... RETURNING`. Requested ids that do not
+    exist are listed in `data.not_found`, and ids of other users' tasks in
+    `data.forbidden`.
     
-    tasks_response = [TaskResponse.model_validate(task).model_dump() for task in new_tasks]
+    Example: complete every task of a category
+    ```json
+    {
+        "filter": {"category": "Trabajo"},
+        "changes": {"status": "completado"}
+    }
+    ```
+    """
     
-    return success_response(
-        message=f"{len(new_tasks)} tareas creadas exitosamente",
-        data=tasks_response
-    )
+    update_data = bulk_data.changes.model_dump(exclude_unset=True)
+    
+    result = task_service.bulk_update_tasks(db, current_user.id, bulk_data, update_data)
+    task_service.task_list_cache.invalidate(current_user.id)
+    
+    return json_response(success_response(
+        message=f"{len(result.tasks)} tareas actualizadas exitosamente",
+        data={
+            "updated": len(result.tasks),
+            "tasks": [task_response_dict(task) for task in result.tasks],
+            "not_found": result.not_found,
+            "forbidden": result.forbidden
+        }
+    ))
 
 
-@router.get("/")
-def get_tasks(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    sort_by: Optional[str] = Query("created_at", description="Campo por el cual ordenar: created_at, start_date, deadline, title, status"),
-    order: Optional[str] = Query("desc", description="Orden: asc o desc"),
-    status: Optional[TaskStatus] = Query(None, description="Filtrar por estado: planificado, en_progreso, completado"),
-    category: Optional[str] = Query(None, description="Filtrar por categoría"),
-    start_date_from: Optional[datetime] = Query(None, description="Filtrar tareas con fecha de inicio desde"),
-    start_date_to: Optional[datetime] = Query(None, description="Filtrar tareas con fecha de inicio hasta"),
-    deadline_from: Optional[datetime] = Query(None, description="Filtrar tareas con deadline desde esta fecha"),
-    deadline_to: Optional[datetime] = Query(None, description="Filtrar tareas con deadline hasta esta fecha"),
-    created_from: Optional[datetime] = Query(None, description="Filtrar tareas creadas desde esta fecha"),
-    created_to: Optional[datetime] = Query(None, description="Filtrar tareas creadas hasta esta fecha"),
-    search: Optional[str] = Query(None, description="Buscar en título o descripción")
+@router.delete("/bulk")
+def delete_tasks_bulk(
+    bulk_data: TaskBulkDelete,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
-    """Get all tasks for the current user with advanced filtering and sorting options"""
+    """
+    Delete many tasks at once
     
-    # Base query
-    query = db.query(Task).filter(Task.user_id == current_user.id)
+    Select the tasks with `ids` **or** with `filter` (same filters as `GET /tasks`).
+    The deletion runs as a single `DELETE ... RETURNING`; ids that were not
+    deleted are reported in `data.not_found` / `data.forbidden`.
     
-    # Apply search filter
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (Task.title.ilike(search_filter)) | 
-            (Task.description.ilike(search_filter))
-        )
+    Example request body:
+    ```json
+    {"ids": [12, 15, 18]}
+    ```
+    """
     
-    # Apply status filter
-    if status:
-        query = query.filter(Task.status == status.value)
+    result = task_service.bulk_delete_tasks(db, current_user.id, bulk_data)
+    task_service.task_list_cache.invalidate(current_user.id)
     
-    # Apply category filter
-    if category:
-        query = query.filter(Task.category == category)
+    return json_response(success_response(
+        message=f"{len(result.tasks)} tareas eliminadas exitosamente",
+        data={
+            "deleted": len(result.tasks),
+            "ids": [task.id for task in result.tasks],
+            "not_found": result.not_found,
+            "forbidden": result.forbidden
+        }
+    ))
+
+
+@router.post("/import")
+async def import_tasks(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Import tasks from a streamed CSV or NDJSON request body
     
-    # Apply start_date filters
-    if start_date_from:
-        query = query.filter(Task.start_date >= start_date_from)
+    Set `Content-Type: text/csv` (first line is the header, same columns as
+    `TaskCreate`: title, description, category, status, start_date, deadline)
+    or `Content-Type: application/x-ndjson` (one JSON object per line).
     
-    if start_date_to:
-        query = query.filter(Task.start_date <= start_date_to)
+    Rows are validated one by one with the `TaskCreate` rules and loaded with
+    Postgres `COPY` in chunks of `TASKS_IMPORT_CHUNK_SIZE`. Invalid rows are
+    reported in `data.errors` (file line number and messages) without aborting the
+    import.
+    """
     
-    # Apply deadline filters
-    if deadline_from:
-        query = query.filter(Task.deadline >= deadline_from)
+    fmt = import_format(request.headers.get("content-type"))
     
-    if deadline_to:
-        query = query.filter(Task.deadline <= deadline_to)
+    async def load_chunk(rows):
+        return await run_in_threadpool(task_import.copy_tasks, db, rows)
     
-    # Apply created_at filters
-    if created_from:
-        query = query.filter(Task.created_at >= created_from)
+    result = await task_import.import_records(
+        task_import.record_stream(fmt, request.stream()),
+        current_user.id,
+        chunk_size=settings.TASKS_IMPORT_CHUNK_SIZE,
+        max_errors=settings.TASKS_IMPORT_MAX_ERRORS,
+        load_chunk=load_chunk
+    )
+    await run_in_threadpool(task_service.task_list_cache.invalidate, current_user.id)
     
-    if created_to:
-        query = query.filter(Task.created_at <= created_to)
+    return json_response(success_response(
+        message=f"{result.imported} tareas importadas, {result.failed} filas con errores",
+        data=result.as_dict()
+    ))
+
+
+@router.get("/")
+def get_tasks(
+    response: Response,
+    params: TaskListParams = Depends(task_list_params),
+    version: int = Depends(task_list_version),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get all tasks for the current user with advanced filtering and sorting options
     
-    # Apply sorting
-    valid_sort_fields = {"created_at", "start_date", "deadline", "title", "status", "updated_at"}
-    if sort_by not in valid_sort_fields:
-        sort_by = "created_at"
+    **Paginación:** si se envía `limit`, la respuesta incluye `next_cursor`.
+    Para obtener la página siguiente, repetir la misma consulta (mismos filtros,
+    `sort_by` y `order`) enviando `cursor=<next_cursor>`. Cuando `next_cursor`
+    es `null` no hay más resultados.
     
-    sort_column = getattr(Task, sort_by)
+    **Campos:** `fields=id,title,status,deadline` devuelve (y lee de la base de
+    datos) solo esos campos de cada tarea.
     
-    if order.lower() == "asc":
-        query = query.order_by(asc(sort_column))
-    else:
-        query = query.order_by(desc(sort_column))
+    Responses (except searches) are cached serialized per user, parameters
+    and data version: any task write makes them stale.
+    """
     
-    tasks = query.all()
+    cache_key = task_service.task_list_cache_key(params)
+    body = task_service.task_list_cache.get(current_user.id, version, cache_key) if cache_key else None
     
-    tasks_response = [TaskResponse.model_validate(task).model_dump() for task in tasks]
+    if body is None:
+        body = task_service.task_list_body(db, current_user.id, params)
+        if cache_key:
+            task_service.task_list_cache.set(current_user.id, version, cache_key, body)
     
-    return success_response(
-        message=f"Se encontraron {len(tasks)} tareas",
-        data=tasks_response
-    )
+    return raw_json_response(body, headers=response.headers)
 
 
-@router.get("/categories")
+@router.get("/categories", dependencies=[Depends(task_data_version)])
 def get_categories(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get all categories with task count for the current user"""
     
-    # Query para obtener categorías y contar tareas
-    categories = db.query(
-        Task.category,
-        func.count(Task.id).label('count')
-    ).filter(
-        Task.user_id == current_user.id,
-        Task.category.isnot(None),
-        Task.category != ''
-    ).group_by(Task.category).order_by(desc('count')).all()
+    categories = task_service.category_counts(db, current_user.id)
     
     categories_response = [
         {"category": cat.category, "count": cat.count}
         for cat in categories
     ]
     
-    return success_response(
+    return json_response(success_response(
         message=f"Se encontraron {len(categories_response)} categorías",
         data=categories_response
-    )
+    ), headers=response.headers)
+
+
+@router.get("/stats")
+def get_task_stats(
+    weeks: int = Query(8, ge=1, le=52, description="Semanas (incluida la actual) de completed_per_week"),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Dashboard statistics of the current user's tasks
+    
+    Counts by status and by category × status, overdue tasks (deadline
+    passed, not completed), tasks due from now to the end of the week and
+    tasks completed in each of the last `weeks` weeks (UTC, Monday to
+    Sunday), all computed in a single grouped query instead of downloading
+    the task list.
+    """
+    
+    stats = task_service.task_stats(db, current_user.id, weeks)
+    
+    return json_response(success_response(
+        message="Estadísticas de tareas",
+        data=stats
+    ))
 
 
 @router.get("/calendar/{year}/{month}")
 def get_calendar_tasks(
     year: int,
     month: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    fields: Optional[str] = Depends(calendar_fields),
+    version: int = Depends(calendar_version),
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all tasks for a specific month (by start_date, deadline, or created_at)"""
-    
-    # Validar mes y año
-    if month < 1 or month > 12:
-        raise BadRequestException(message="El mes debe estar entre 1 y 12")
-    
-    if year < 2000 or year > 2100:
-        raise BadRequestException(message="El año debe estar entre 2000 y 2100")
-    
-    # Obtener el primer y último día del mes
-    from datetime import datetime, timezone
-    first_day = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
-    
-    # Calcular el último día del mes
-    if month == 12:
-        last_day = datetime(year + 1, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-    else:
-        last_day = datetime(year, month + 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-    
-    # Query: tareas que tengan start_date, deadline o created_at en este mes
-    tasks = db.query(Task).filter(
-        Task.user_id == current_user.id,
-        (
-            (Task.start_date >= first_day) & (Task.start_date < last_day) |
-            (Task.deadline >= first_day) & (Task.deadline < last_day) |
-            (Task.created_at >= first_day) & (Task.created_at < last_day)
-        )
-    ).order_by(asc(Task.start_date)).all()
-    
-    tasks_response = [TaskResponse.model_validate(task).model_dump() for task in tasks]
-    
-    return success_response(
-        message=f"Se encontraron {len(tasks)} tareas para {month}/{year}",
-        data={
-            "year": year,
-            "month": month,
-            "total_tasks": len(tasks),
-            "tasks": tasks_response
-        }
-    )
+    """
+    Get all tasks for a specific month (by start_date, deadline, or created_at)
+    
+    Months are cached per user and data version: any task write makes the
+    cached months stale.
+    """
+    
+    body = task_service.calendar_body(db, current_user.id, year, month, version, fields)
+    
+    return raw_json_response(body, headers=response.headers)
 
 
 @router.get("/{task_id}")
 def get_task(
     task_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific task by ID"""
     
-    task = db.query(Task).filter(Task.id == task_id).first()
-    
-    if not task:
-        raise NotFoundException(message="Tarea no encontrada")
-    
-    # Check if task belongs to current user
-    if task.user_id != current_user.id:
-        raise ForbiddenException(message="No tienes permiso para acceder a esta tarea")
-    
-    task_response = TaskResponse.model_validate(task)
+    task = task_service.get_owned_task(
+        db, current_user.id, task_id, "No tienes permiso para acceder a esta tarea"
+    )
     
-    return success_response(
+    return json_response(success_response(
         message="Tarea obtenida exitosamente",
-        data=task_response.model_dump()
-    )
+        data=task_response_dict(task)
+    ))
 
 
 @router.put("/{task_id}")
 def update_task(
     task_id: int,
     task_data: TaskUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update a task"""
     
-    task = db.query(Task).filter(Task.id == task_id).first()
-    
-    if not task:
-        raise NotFoundException(message="Tarea no encontrada")
-    
-    # Check if task belongs to current user
-    if task.user_id != current_user.id:
-        raise ForbiddenException(message="No tienes permiso para editar esta tarea")
-    
     # Update only provided fields
     update_data = task_data.model_dump(exclude_unset=True)
     
-    if not update_data:
-        raise BadRequestException(message="No se proporcionaron campos para actualizar")
-    
-    for field, value in update_data.items():
-        # Convertir el enum status a su valor string
-        if field == "status" and value is not None:
-            setattr(task, field, value.value if hasattr(value, 'value') else value)
-        else:
-            setattr(task, field, value)
-    
-    db.commit()
-    db.refresh(task)
-    
-    task_response = TaskResponse.model_validate(task)
+    task = task_service.update_task(db, current_user.id, task_id, update_data)
+    task_service.task_list_cache.invalidate(current_user.id)
     
-    return success_response(
+    return json_response(success_response(
         message="Tarea actualizada exitosamente",
-        data=task_response.model_dump()
-    )
+        data=task_response_dict(task)
+    ))
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_200_OK)
 def delete_task(
     task_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: AuthenticatedUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a task"""
     
-    task = db.query(Task).filter(Task.id == task_id).first()
-    
-    if not task:
-        raise NotFoundException(message="Tarea no encontrada")
-    
-    # Check if task belongs to current user
-    if task.user_id != current_user.id:
-        raise ForbiddenException(message="No tienes permiso para eliminar esta tarea")
+    task_service.delete_task(db, current_user.id, task_id)
+    task_service.task_list_cache.invalidate(current_user.id)
     
-    db.delete(task)
-    db.commit()
-    
-    return success_response(
+    return json_response(success_response(
         message="Tarea eliminada exitosamente",
         data={"id": task_id}
-    )
-
+    ))
@@ -0,0 +1,361 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.etag import check_not_modified, make_etag
+from app.core.jwt import AuthenticatedUser, get_current_user_async
+from app.core.read_routing import get_read_async_db, routed_data_version
+from app.core.response import json_response, raw_json_response, success_response
+from app.schemas.schemas import TaskCreate, TaskUpdate, TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete
+from app.services import tasks as task_service
+from app.services import task_import
+from app.services.task_import import import_format
+from app.services.tasks import TaskListParams, task_response_dict
+
+# Versión async de app/api/tasks.py (ASYNC_DATABASE=true).
+# La lógica de datos vive en app/services/tasks.py y se ejecuta con
+# AsyncSession.run_sync, de modo que la E/S va por asyncpg sin ocupar
+# un hilo del threadpool durante la espera a Postgres.
+
+router = APIRouter()
+
+
+async def task_data_version(
+    request: Request,
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_async_db)
+) -> int:
+    """ETag / If-None-Match for task reads (see app/api/tasks.py); returns the data version"""
+    version = routed_data_version(request)
+    if version is None:
+        version = await db.run_sync(task_service.data_version, current_user.id)
+    check_not_modified(request, response, make_etag(current_user.id, version))
+    return version
+
+
+async def task_list_params(
+    params: TaskListParams = Depends(),
+    db: AsyncSession = Depends(get_read_async_db)
+) -> TaskListParams:
+    """GET /tasks parameters with `fields` and `cursor` validated"""
+    await db.run_sync(task_service.validate_task_list_params, params)
+    return params
+
+
+async def task_list_version(
+    request: Request,
+    response: Response,
+    params: TaskListParams = Depends(task_list_params),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_async_db)
+) -> int:
+    """task_data_version for GET /tasks, once its parameters are valid (a bad request is a 400, never a 304)"""
+    return await task_data_version(request, response, current_user, db)
+
+
+def calendar_fields(
+    year: int,
+    month: int,
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas, ej: id,title,status,deadline (por defecto todos)")
+) -> Optional[str]:
+    """`fields` of a calendar request, with it and the month validated"""
+    task_service.validate_calendar_month(year, month)
+    task_service.response_fields(fields)
+    return fields
+
+
+async def calendar_version(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Depends(calendar_fields),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_async_db)
+) -> int:
+    """task_data_version for the calendar, once the month and fields are valid"""
+    return await task_data_version(request, response, current_user, db)
+
+
+async def list_cache_call(method, *args):
+    """Call task_list_cache, in the threadpool when its backend does network I/O (Redis)"""
+    if task_service.task_list_cache.blocking:
+        return await run_in_threadpool(method, *args)
+    return method(*args)
+
+
+async def invalidate_task_lists(user_id: int) -> None:
+    """Drop the user's cached GET /tasks responses after a task write"""
+    await list_cache_call(task_service.task_list_cache.invalidate, user_id)
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_task(
+    task_data: TaskCreate,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a new task"""
+    
+    new_task = await db.run_sync(task_service.create_task, current_user.id, task_data)
+    await invalidate_task_lists(current_user.id)
+    
+    return json_response(success_response(
+        message="Tarea creada exitosamente",
+        data=task_response_dict(new_task)
+    ), status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+async def create_tasks_bulk(
+    bulk_data: TaskBulkCreate,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create multiple tasks at once
+    
+    **Note:** This endpoint accepts JSON only, with the body `{"tasks": [TaskCreate, ...]}`.
+    To import CSV or NDJSON files, stream them to `POST /tasks/import`.
+    Tasks are committed in chunks of `TASKS_BULK_CHUNK_SIZE`.
+    """
+    
+    new_tasks = await db.run_sync(task_service.create_tasks, current_user.id, bulk_data.tasks)
+    await invalidate_task_lists(current_user.id)
+    
+    tasks_response = [task_response_dict(task) for task in new_tasks]
+    
+    return json_response(success_response(
+        message=f"{len(new_tasks)} tareas creadas exitosamente",
+        data=tasks_response
+    ), status_code=status.HTTP_201_CREATED)
+
+
+@router.patch("/bulk")
+async def update_tasks_bulk(
+    bulk_data: TaskBulkUpdate,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update many tasks at once: `ids` or `filter` (same filters as `GET /tasks`)
+    plus the fields to change in `changes`, applied with one `UPDATE ... RETURNING`
+    """
+    
+    update_data = bulk_data.changes.model_dump(exclude_unset=True)
+    
+    result = await db.run_sync(task_service.bulk_update_tasks, current_user.id, bulk_data, update_data)
+    await invalidate_task_lists(current_user.id)
+    
+    return json_response(success_response(
+        message=f"{len(result.tasks)} tareas actualizadas exitosamente",
+        data={
+            "updated": len(result.tasks),
+            "tasks": [task_response_dict(task) for task in result.tasks],
+            "not_found": result.not_found,
+            "forbidden": result.forbidden
+        }
+    ))
+
+
+@router.delete("/bulk")
+async def delete_tasks_bulk(
+    bulk_data: TaskBulkDelete,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete many tasks at once: `ids` or `filter` (same filters as `GET /tasks`),
+    applied with one `DELETE ... RETURNING`
+    """
+    
+    result = await db.run_sync(task_service.bulk_delete_tasks, current_user.id, bulk_data)
+    await invalidate_task_lists(current_user.id)
+    
+    return json_response(success_response(
+        message=f"{len(result.tasks)} tareas eliminadas exitosamente",
+        data={
+            "deleted": len(result.tasks),
+            "ids": [task.id for task in result.tasks],
+            "not_found": result.not_found,
+            "forbidden": result.forbidden
+        }
+    ))
+
+
+@router.post("/import")
+async def import_tasks(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Import tasks from a streamed CSV (`text/csv`) or NDJSON
+    (`application/x-ndjson`) request body, loaded with Postgres `COPY`
+    """
+    
+    fmt = import_format(request.headers.get("content-type"))
+    
+    async def load_chunk(rows):
+        return await db.run_sync(task_import.copy_tasks, rows)
+    
+    result = await task_import.import_records(
+        task_import.record_stream(fmt, request.stream()),
+        current_user.id,
+        chunk_size=settings.TASKS_IMPORT_CHUNK_SIZE,
+        max_errors=settings.TASKS_IMPORT_MAX_ERRORS,
+        load_chunk=load_chunk
+    )
+    await invalidate_task_lists(current_user.id)
+    
+    return json_response(success_response(
+        message=f"{result.imported} tareas importadas, {result.failed} filas con errores",
+        data=result.as_dict()
+    ))
+
+
+@router.get("/")
+async def get_tasks(
+    response: Response,
+    params: TaskListParams = Depends(task_list_params),
+    version: int = Depends(task_list_version),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_async_db)
+):
+    """
+    Get all tasks for the current user with advanced filtering and sorting options
+    
+    **Paginación:** si se envía `limit`, la respuesta incluye `next_cursor`.
+    Para obtener la página siguiente, repetir la misma consulta (mismos filtros,
+    `sort_by` y `order`) enviando `cursor=<next_cursor>`. Cuando `next_cursor`
+    es `null` no hay más resultados.
+    """
+    
+    cache_key = task_service.task_list_cache_key(params)
+    body = await list_cache_call(task_service.task_list_cache.get, current_user.id, version, cache_key) if cache_key else None
+    
+    if body is None:
+        body = await db.run_sync(task_service.task_list_body, current_user.id, params)
+        if cache_key:
+            await list_cache_call(task_service.task_list_cache.set, current_user.id, version, cache_key, body)
+    
+    return raw_json_response(body, headers=response.headers)
+
+
+@router.get("/categories", dependencies=[Depends(task_data_version)])
+async def get_categories(
+    response: Response,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_async_db)
+):
+    """Get all categories with task count for the current user"""
+    
+    categories = await db.run_sync(task_service.category_counts, current_user.id)
+    
+    categories_response = [
+        {"category": cat.category, "count": cat.count}
+        for cat in categories
+    ]
+    
+    return json_response(success_response(
+        message=f"Se encontraron {len(categories_response)} categorías",
+        data=categories_response
+    ), headers=response.headers)
+
+
+@router.get("/stats")
+async def get_task_stats(
+    weeks: int = Query(8, ge=1, le=52, description="Semanas (incluida la actual) de completed_per_week"),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_async_db)
+):
+    """Dashboard statistics of the current user's tasks (see app/api/tasks.py)"""
+    
+    stats = await db.run_sync(task_service.task_stats, current_user.id, weeks)
+    
+    return json_response(success_response(
+        message="Estadísticas de tareas",
+        data=stats
+    ))
+
+
+@router.get("/calendar/{year}/{month}")
+async def get_calendar_tasks(
+    year: int,
+    month: int,
+    response: Response,
+    fields: Optional[str] = Depends(calendar_fields),
+    version: int = Depends(calendar_version),
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_async_db)
+):
+    """
+    Get all tasks for a specific month (by start_date, deadline, or created_at)
+    
+    Months are cached per user and data version: any task write makes the
+    cached months stale.
+    """
+    
+    body = await db.run_sync(task_service.calendar_body, current_user.id, year, month, version, fields)
+    
+    return raw_json_response(body, headers=response.headers)
+
+
+@router.get("/{task_id}")
+async def get_task(
+    task_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_read_async_db)
+):
+    """Get a specific task by ID"""
+    
+    task = await db.run_sync(
+        task_service.get_owned_task,
+        current_user.id, task_id, "No tienes permiso para acceder a esta tarea"
+    )
+    
+    return json_response(success_response(
+        message="Tarea obtenida exitosamente",
+        data=task_response_dict(task)
+    ))
+
+
+@router.put("/{task_id}")
+async def update_task(
+    task_id: int,
+    task_data: TaskUpdate,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update a task"""
+    
+    # Update only provided fields
+    update_data = task_data.model_dump(exclude_unset=True)
+    
+    task = await db.run_sync(task_service.update_task, current_user.id, task_id, update_data)
+    await invalidate_task_lists(current_user.id)
+    
+    return json_response(success_response(
+        message="Tarea actualizada exitosamente",
+        data=task_response_dict(task)
+    ))
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_200_OK)
+async def delete_task(
+    task_id: int,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Delete a task"""
+    
+    await db.run_sync(task_service.delete_task, current_user.id, task_id)
+    await invalidate_task_lists(current_user.id)
+    
+    return json_response(success_response(
+        message="Tarea eliminada exitosamente",
+        data={"id": task_id}
+    ))
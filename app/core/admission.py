@@ -0,0 +1,309 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Hashable, Optional
+
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.exceptions import APIException
+from app.core.jwt import get_token_user_id
+from app.core.metrics import labels
+from app.core.response import error_response
+
+# Clases de ruta con su propio cupo de concurrencia
+AUTH_ROUTES = "auth"
+READ_ROUTES = "read"
+WRITE_ROUTES = "write"
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+# Estimación inicial del tiempo de servicio (hasta medir requests reales) y
+# peso de cada request nueva en la media móvil
+INITIAL_SERVICE_TIME = 0.05
+SERVICE_TIME_ALPHA = 0.2
+
+MAX_RETRY_AFTER = 60
+
+REJECTION_REASONS = ("queue_full", "user_queue_full", "deadline", "timeout")
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionLimiter:
+    """
+    Concurrency cap for one route class with a bounded wait queue.
+
+    Waiters are queued per client and served round-robin, and each client
+    has its own cap of requests in flight and waiting, so one heavy client
+    cannot take every slot. Only the event loop thread touches it (like the
+    metrics registry), so no locks are needed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        queue_size: int,
+        max_wait: float,
+        user_limit: int,
+        user_queue_size: int
+    ):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.user_limit = user_limit
+        self.user_queue_size = user_queue_size
+
+        self.active = 0
+        self.queued = 0
+        self.active_by_client: Dict[Hashable, int] = {}
+        self.waiting: "OrderedDict[Hashable, Deque[asyncio.Future]]" = OrderedDict()
+        self.service_time = INITIAL_SERVICE_TIME
+        self.admitted = 0
+        self.rejected = dict.fromkeys(REJECTION_REASONS, 0)
+
+    def has_room(self, client: Hashable) -> bool:
+        return self.active < self.limit and self.active_by_client.get(client, 0) < self.user_limit
+
+    def estimated_wait(self, ahead: int) -> float:
+        """Seconds until a slot frees up for a request with `ahead` waiters in front of it"""
+        return (ahead + 1) / self.limit * self.service_time
+
+    async def acquire(self, client: Hashable) -> None:
+        # Tras cada release la cola se despacha hasta llenar los cupos, así que
+        # si hay lugar para este cliente no hay nadie elegible esperando antes
+        if self.has_room(client):
+            self._grant(client)
+            return
+
+        client_queue = self.waiting.get(client)
+        if self.queued >= self.queue_size:
+            raise self._reject("queue_full")
+        if client_queue is not None and len(client_queue) >= self.user_queue_size:
+            raise self._reject("user_queue_full")
+        # Si no va a entrar antes de la espera máxima, rechazar ya y no al final
+        if self.estimated_wait(self.queued) > self.max_wait:
+            raise self._reject("deadline")
+
+        waiter = asyncio.get_running_loop().create_future()
+        if client_queue is None:
+            client_queue = self.waiting[client] = deque()
+        client_queue.append(waiter)
+        self.queued += 1
+
+        try:
+            await asyncio.wait((waiter,), timeout=self.max_wait)
+        except BaseException:
+            # El cliente se desconectó mientras esperaba
+            if waiter.done():
+                self.release(client)
+            else:
+                self._discard(client, waiter)
+            raise
+
+        if not waiter.done():
+            self._discard(client, waiter)
+            raise self._reject("timeout")
+
+    def release(self, client: Hashable, elapsed: Optional[float] = None) -> None:
+        self.active -= 1
+        remaining = self.active_by_client[client] - 1
+        if remaining:
+            self.active_by_client[client] = remaining
+        else:
+            del self.active_by_client[client]
+
+        if elapsed is not None:
+            self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+        self._dispatch()
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue should have drained"""
+        return min(MAX_RETRY_AFTER, max(1, math.ceil(self.estimated_wait(self.queued))))
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "queue_size": self.queue_size,
+            "clients_active": len(self.active_by_client),
+            "clients_waiting": len(self.waiting),
+            "service_time_ms": round(self.service_time * 1000, 2),
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected)
+        }
+
+    def _grant(self, client: Hashable) -> None:
+        self.active += 1
+        self.active_by_client[client] = self.active_by_client.get(client, 0) + 1
+        self.admitted += 1
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        return AdmissionRejected(reason, self.retry_after())
+
+    def _discard(self, client: Hashable, waiter: asyncio.Future) -> None:
+        waiter.cancel()
+        client_queue = self.waiting[client]
+        client_queue.remove(waiter)
+        self.queued -= 1
+        if not client_queue:
+            del self.waiting[client]
+
+    def _dispatch(self) -> None:
+        # Round-robin entre clientes: el atendido pasa al final de la fila
+        while self.queued and self.active < self.limit:
+            client = next((client for client in self.waiting if self.has_room(client)), None)
+            if client is None:
+                return
+            client_queue = self.waiting[client]
+            waiter = client_queue.popleft()
+            self.queued -= 1
+            if client_queue:
+                self.waiting.move_to_end(client)
+            else:
+                del self.waiting[client]
+            self._grant(client)
+            waiter.set_result(None)
+
+
+class AdmissionController:
+    """One limiter per route class, and the routing of requests to them"""
+
+    def __init__(self, limiters: Dict[str, AdmissionLimiter], api_prefix: str):
+        self.limiters = limiters
+        self.api_prefix = api_prefix
+        self.auth_prefix = f"{api_prefix}/auth"
+
+    def route_class(self, scope) -> Optional[str]:
+        """Route class of a request; None for the routes outside the API (health, docs, metrics)"""
+        path = scope["path"]
+        if scope["method"] == "OPTIONS" or not path.startswith(self.api_prefix):
+            return None
+        if path.startswith(self.auth_prefix):
+            return AUTH_ROUTES
+        return READ_ROUTES if scope["method"] in READ_METHODS else WRITE_ROUTES
+
+    def limiter_for(self, scope) -> Optional[AdmissionLimiter]:
+        route_class = self.route_class(scope)
+        return self.limiters[route_class] if route_class is not None else None
+
+    def stats(self) -> dict:
+        return {name: limiter.stats() for name, limiter in self.limiters.items()}
+
+    def render(self) -> str:
+        """Prometheus text exposition of the limiters (appended to /metrics)"""
+        lines = [
+            "# HELP http_admission_in_flight Requests admitted and in flight by route class.",
+            "# TYPE http_admission_in_flight gauge",
+        ]
+        lines += [
+            f"http_admission_in_flight{labels(route_class=name)} {limiter.active}"
+            for name, limiter in self.limiters.items()
+        ]
+        lines += [
+            "# HELP http_admission_queued Requests waiting for a slot by route class.",
+            "# TYPE http_admission_queued gauge",
+        ]
+        lines += [
+            f"http_admission_queued{labels(route_class=name)} {limiter.queued}"
+            for name, limiter in self.limiters.items()
+        ]
+        lines += [
+            "# HELP http_admission_rejected_total Requests rejected with 503 by route class and reason.",
+            "# TYPE http_admission_rejected_total counter",
+        ]
+        for name, limiter in self.limiters.items():
+            for reason, count in limiter.rejected.items():
+                lines.append(f"http_admission_rejected_total{labels(route_class=name, reason=reason)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def build_admission_controller() -> AdmissionController:
+    def limiter(name: str, limit: int) -> AdmissionLimiter:
+        return AdmissionLimiter(
+            name,
+            limit=limit,
+            queue_size=settings.ADMISSION_QUEUE_SIZE,
+            max_wait=settings.ADMISSION_MAX_WAIT_MS / 1000,
+            user_limit=settings.ADMISSION_USER_CONCURRENCY,
+            user_queue_size=settings.ADMISSION_USER_QUEUE_SIZE
+        )
+
+    return AdmissionController(
+        {
+            AUTH_ROUTES: limiter(AUTH_ROUTES, settings.ADMISSION_AUTH_CONCURRENCY),
+            READ_ROUTES: limiter(READ_ROUTES, settings.ADMISSION_READ_CONCURRENCY),
+            WRITE_ROUTES: limiter(WRITE_ROUTES, settings.ADMISSION_WRITE_CONCURRENCY),
+        },
+        settings.API_V1_STR
+    )
+
+
+admission = build_admission_controller()
+
+
+def client_key(scope) -> Hashable:
+    """
+    Fairness key: the user of a valid access token (verified through the
+    token cache), else the client IP (behind a proxy, run uvicorn with
+    --proxy-headers so it is the real client and not the proxy)
+    """
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    return ("user", get_token_user_id(token))
+                except APIException:
+                    pass
+            break
+
+    client = scope.get("client")
+    return ("ip", client[0] if client else None)
+
+
+class AdmissionControlMiddleware:
+    """
+    Load shedding: caps requests in flight per route class (auth, reads,
+    writes) so a slow database makes requests wait in a short, fair queue or
+    fail fast with 503 + Retry-After instead of piling up in the threadpool
+    and the connection pool until clients time out
+    """
+
+    def __init__(self, app, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.controller.limiter_for(scope) if scope["type"] == "http" else None
+        if limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        client = client_key(scope)
+        try:
+            await limiter.acquire(client)
+        except AdmissionRejected as rejected:
+            response = JSONResponse(
+                status_code=503,
+                content=error_response(message="Servidor saturado. Intente nuevamente en unos segundos."),
+                headers={"Retry-After": str(rejected.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(client, time.perf_counter() - started)
@@ -5,6 +5,24 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # Usar SQLAlchemy asyncio (asyncpg) y rutas async en lugar del threadpool
+    ASYNC_DATABASE: bool = False
+    # Réplica de solo lectura opcional: los GET de tareas leen de ella cuando
+    # ya aplicó todas las escrituras del usuario (si no, leen del primario)
+    DATABASE_REPLICA_URL: Optional[str] = None
+    
+    # Pool de conexiones, por proceso y por engine (primario, réplica): con N
+    # workers se abren hasta N × (DB_POOL_SIZE + DB_MAX_OVERFLOW) conexiones
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30
+    # Segundos antes de reciclar una conexión (-1 = nunca); por debajo del
+    # timeout de inactividad del servidor permite desactivar el pre-ping
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = True
+    # DATABASE_URL apunta a un pooler en modo transacción (PgBouncer, endpoint
+    # "-pooler" de Neon): NullPool y sin prepared statements del lado servidor
+    DB_TRANSACTION_POOLER: bool = False
     
     # JWT Configuration
     SECRET_KEY: str
@@ -12,11 +30,92 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     
+    # Cache en memoria del usuario autenticado (get_current_user). Es por
+    # proceso: un cambio de nombre/email o un borrado se quita del cache al
+    # confirmarse en el proceso que lo hizo; los demás workers pueden servir
+    # el usuario anterior hasta USER_CACHE_TTL_SECONDS
+    USER_CACHE_ENABLED: bool = True
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    
+    # Cache LRU de tokens ya verificados (decode_token)
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    
+    # Pool dedicado para bcrypt (login/registro)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_DEPTH: int = 16
+    
     # API Configuration
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "Task Management API"
     DEBUG: bool = True
     
+    # Búsqueda full-text (requiere PostgreSQL y la migración de tasks.search_vector)
+    TASKS_FULL_TEXT_SEARCH: bool = True
+    
+    # Pagination
+    TASKS_PAGE_MAX_LIMIT: int = 500
+    
+    # Creación masiva: tareas por INSERT ... RETURNING y transacción
+    TASKS_BULK_CHUNK_SIZE: int = 1000
+    
+    # Importación CSV/NDJSON en streaming (COPY)
+    TASKS_IMPORT_CHUNK_SIZE: int = 5000
+    TASKS_IMPORT_MAX_ERRORS: int = 100
+    
+    # Cache en memoria (por proceso) del calendario por (usuario, año, mes),
+    # validado con la versión de datos del usuario y acotado en bytes: LRU de
+    # usuarios con hasta MAX_PER_USER meses cada uno (el TTL solo libera memoria)
+    CALENDAR_CACHE_ENABLED: bool = True
+    CALENDAR_CACHE_TTL_SECONDS: int = 300
+    CALENDAR_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    CALENDAR_CACHE_MAX_PER_USER: int = 12
+    CALENDAR_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    
+    # Cache de respuestas de GET /tasks (bytes ya serializados) por usuario,
+    # filtros y versión de datos. Backend: "local" (LRU en memoria por
+    # proceso), "redis" (TASKS_LIST_CACHE_URL, compartido) o "memory" (sustituto
+    # local del backend clave-valor, para tests)
+    TASKS_LIST_CACHE_ENABLED: bool = True
+    TASKS_LIST_CACHE_BACKEND: str = "local"
+    TASKS_LIST_CACHE_URL: Optional[str] = None
+    TASKS_LIST_CACHE_TTL_SECONDS: int = 300
+    TASKS_LIST_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # Entradas por usuario, al menos 1 (para desactivar: TASKS_LIST_CACHE_ENABLED)
+    TASKS_LIST_CACHE_MAX_PER_USER: int = 16
+    TASKS_LIST_CACHE_MAX_ENTRY_BYTES: int = 1024 * 1024
+    
+    # Nivel de los logs de la app (JSON por línea: app.requests, app.sql)
+    LOG_LEVEL: str = "INFO"
+    
+    # Sentencias y tiempo de BD por request (header Server-Timing y log por
+    # request), log de consultas lentas y, con DEBUG, aviso de posibles N+1
+    SQL_INSTRUMENTATION_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200
+    N_PLUS_ONE_THRESHOLD: int = 5
+    
+    # Métricas Prometheus en GET /metrics (por proceso; no exponer públicamente)
+    METRICS_ENABLED: bool = True
+    
+    # Token (Bearer) de los endpoints operativos: /metrics, /debug/pool,
+    # /debug/cache y /debug/admission. Sin definir, esos endpoints responden 404
+    INTERNAL_API_TOKEN: Optional[str] = None
+    
+    # Control de admisión: requests en curso por clase de ruta (auth, lecturas,
+    # escrituras); el resto espera en una cola acotada o recibe 503 con
+    # Retry-After. Lecturas + escrituras ≈ DB_POOL_SIZE + DB_MAX_OVERFLOW
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_AUTH_CONCURRENCY: int = 8
+    ADMISSION_READ_CONCURRENCY: int = 20
+    ADMISSION_WRITE_CONCURRENCY: int = 10
+    ADMISSION_QUEUE_SIZE: int = 100
+    # Espera máxima en la cola; debe quedar por debajo del timeout de los clientes
+    ADMISSION_MAX_WAIT_MS: float = 2000
+    # Equidad: requests en curso y en cola por usuario (o IP sin token) y clase
+    ADMISSION_USER_CONCURRENCY: int = 5
+    ADMISSION_USER_QUEUE_SIZE: int = 10
+    
     # CORS - Variable opcional para override desde .env
     BACKEND_CORS_ORIGINS: Optional[str] = None
     
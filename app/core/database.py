@@ -1,14 +1,34 @@
+from uuid import uuid4
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.db_pool import ObservedAsyncQueuePool, ObservedNullPool, ObservedQueuePool
+
+
+def pool_options(async_driver: bool = False) -> dict:
+    """
+    Pool keyword arguments for create_engine / create_async_engine, from
+    Settings. In transaction-pooler mode the external pooler owns the
+    connections, so each checkout opens (and each checkin closes) one.
+    """
+    if settings.DB_TRANSACTION_POOLER:
+        return {"poolclass": ObservedNullPool}
+    
+    return {
+        "poolclass": ObservedAsyncQueuePool if async_driver else ObservedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING
+    }
+
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+engine = create_engine(settings.DATABASE_URL, **pool_options())
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -21,3 +41,136 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def read_only_connect_args(database_url: str, async_driver: bool = False) -> dict:
+    """
+    connect_args that open every transaction as READ ONLY, so a replica
+    session fails loudly instead of writing (only PostgreSQL; {} otherwise)
+    """
+    if make_url(database_url).get_backend_name() != "postgresql":
+        return {}
+    if settings.DB_TRANSACTION_POOLER:
+        # PgBouncer en modo transacción rechaza parámetros de arranque (options)
+        return {}
+    if async_driver:
+        return {"server_settings": {"default_transaction_read_only": "on"}}
+    return {"options": "-c default_transaction_read_only=on"}
+
+
+# Réplica de solo lectura (opcional, DATABASE_REPLICA_URL) para los GET de tareas
+replica_engine = None
+ReplicaSessionLocal = None
+
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        connect_args=read_only_connect_args(settings.DATABASE_REPLICA_URL),
+        **pool_options()
+    )
+    ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine)
+
+
+# Async engine (opcional, se activa con ASYNC_DATABASE=true)
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+}
+
+ASYNCPG_TRANSACTION_POOLER_ARGS = {
+    "statement_cache_size": 0,
+    "prepared_statement_cache_size": 0,
+    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+}
+
+
+def make_async_url(database_url: str):
+    """
+    Convert a sync DATABASE_URL into its async-driver equivalent.
+    Returns (url, connect_args); asyncpg does not understand libpq's
+    sslmode/channel_binding query parameters, so sslmode is moved to connect_args.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    connect_args = {}
+    
+    if backend == "postgresql" and settings.DB_TRANSACTION_POOLER:
+        # asyncpg prepara cada sentencia en el servidor; tras un pooler en modo
+        # transacción la siguiente sentencia puede ir a otra conexión, así que
+        # sin cache de sentencias y con nombres únicos
+        connect_args.update(ASYNCPG_TRANSACTION_POOLER_ARGS)
+    
+    if url.drivername in ASYNC_DRIVERS.values():
+        return url, connect_args
+    
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No hay driver asíncrono configurado para '{backend}'")
+    
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    
+    if backend == "postgresql":
+        query = dict(url.query)
+        sslmode = query.pop("sslmode", None)
+        query.pop("channel_binding", None)
+        url = url.set(query=query)
+        if sslmode and sslmode != "disable":
+            connect_args["ssl"] = sslmode
+    
+    return url, connect_args
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.ASYNC_DATABASE:
+    async_url, async_connect_args = make_async_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(
+        async_url,
+        connect_args=async_connect_args,
+        **pool_options(async_driver=True)
+    )
+    
+    # expire_on_commit=False: los objetos se serializan fuera de la sesión
+    # y en modo async no se puede hacer lazy-load implícito
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
+
+if settings.ASYNC_DATABASE and settings.DATABASE_REPLICA_URL:
+    replica_url, replica_connect_args = make_async_url(settings.DATABASE_REPLICA_URL)
+    async_replica_engine = create_async_engine(
+        replica_url,
+        connect_args={
+            **replica_connect_args,
+            **read_only_connect_args(settings.DATABASE_REPLICA_URL, async_driver=True)
+        },
+        **pool_options(async_driver=True)
+    )
+    AsyncReplicaSessionLocal = async_sessionmaker(
+        async_replica_engine,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("ASYNC_DATABASE no está habilitado")
+    
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of every engine (primary, replica, sync and async) on shutdown"""
+    for db_engine in (engine, replica_engine):
+        if db_engine is not None:
+            db_engine.dispose()
+    for db_engine in (async_engine, async_replica_engine):
+        if db_engine is not None:
+            await db_engine.dispose()
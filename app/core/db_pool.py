@@ -0,0 +1,77 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+
+class CheckoutStatsMixin:
+    """
+    Pool mixin that times every checkout (queue wait, plus the connect or
+    pre-ping round trip when there is one) and counts pool timeouts
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._stats_lock = threading.Lock()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def checkout_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else None,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+            }
+
+
+class ObservedQueuePool(CheckoutStatsMixin, QueuePool):
+    pass
+
+
+class ObservedAsyncQueuePool(CheckoutStatsMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class ObservedNullPool(CheckoutStatsMixin, NullPool):
+    pass
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    """Live state of an engine's pool plus its checkout counters (for /debug/pool)"""
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+        })
+
+    if isinstance(pool, CheckoutStatsMixin):
+        stats.update(pool.checkout_stats())
+
+    return stats
@@ -0,0 +1,38 @@
+from typing import Dict, Optional
+
+from fastapi import Request, Response
+
+from app.core.exceptions import NotModifiedException
+
+# Las respuestas dependen del usuario: solo cache privado y siempre revalidar
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag built from the values that identify a version of the data"""
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header (list of ETags or *) against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def check_not_modified(request: Request, response: Response, etag: str) -> str:
+    """
+    Raise NotModifiedException (empty 304) if the client already has this
+    ETag; otherwise add the ETag to the response that the route will build.
+    """
+    headers: Dict[str, str] = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise NotModifiedException(headers=headers)
+    response.headers.update(headers)
+    return etag
@@ -1,5 +1,5 @@
 from fastapi import HTTPException, status
-from typing import Any, Optional
+from typing import Any, Dict, Optional
 
 
 class APIException(HTTPException):
@@ -10,7 +10,8 @@ class APIException(HTTPException):
         status_code: int,
         message: str,
         success: bool = False,
-        data: Optional[Any] = None
+        data: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None
     ):
         self.status_code = status_code
         self.message = message
@@ -20,7 +21,7 @@ class APIException(HTTPException):
             "success": success,
             "message": message,
             "data": data
-        })
+        }, headers=headers)
 
 
 class BadRequestException(APIException):
@@ -81,3 +82,26 @@ class InternalServerException(APIException):
             success=False,
             data=data
         )
+
+
+class ServiceUnavailableException(APIException):
+    def __init__(
+        self,
+        message: str = "Service Unavailable",
+        data: Optional[Any] = None,
+        retry_after: Optional[int] = None
+    ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            message=message,
+            success=False,
+            data=data,
+            headers={"Retry-After": str(retry_after)} if retry_after is not None else None
+        )
+
+
+class NotModifiedException(HTTPException):
+    """Conditional GET hit (If-None-Match): answered with an empty 304, not an error envelope"""
+    
+    def __init__(self, headers: Dict[str, str]):
+        super().__init__(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -0,0 +1,29 @@
+import hmac
+from typing import Optional
+
+from fastapi import Depends
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core.config import settings
+from app.core.exceptions import NotFoundException, UnauthorizedException
+
+# Esquema aparte del token de usuario: los endpoints internos no usan JWT
+internal_bearer = HTTPBearer(scheme_name="InternalToken", auto_error=False)
+
+
+def require_internal_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(internal_bearer)
+) -> None:
+    """
+    Guard of the operational endpoints (/metrics, /debug/pool, /debug/cache,
+    /debug/admission): they do not exist (404) unless INTERNAL_API_TOKEN is
+    set, and then require it as `Authorization: Bearer <token>`.
+    """
+    token = settings.INTERNAL_API_TOKEN
+    if not token:
+        raise NotFoundException(message="Recurso no encontrado")
+
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode("utf-8"), token.encode("utf-8")
+    ):
+        raise UnauthorizedException(message="Token interno inválido o ausente")
@@ -1,12 +1,18 @@
+import hashlib
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
 
+from app.core.cache import TTLCache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, get_async_db
 from app.core.exceptions import UnauthorizedException
 from app.models.models import User
 
@@ -40,24 +46,39 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
+# Cache de payloads ya verificados, por digest del token: un mismo access token
+# se envía cientos de veces durante su vida y la firma no cambia
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE if settings.TOKEN_CACHE_ENABLED else 0,
+    ttl=0
+)
+
+
 def decode_token(token: str) -> Dict[str, Any]:
     """Decode and verify JWT token"""
+    cache_key = hashlib.sha256(token.encode("utf-8")).digest()
+    
+    cached = token_cache.get(cache_key)
+    # Un hit nunca salta la expiración: la entrada vive solo hasta el exp del token
+    if cached is not None and cached["exp"] > time.time():
+        return dict(cached)
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except jwt.ExpiredSignatureError:
         raise UnauthorizedException(message="El token ha expirado. Por favor inicie sesión nuevamente.")
     except JWTError as e:
         raise UnauthorizedException(message=f"Token inválido: {str(e)}")
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(cache_key, dict(payload), ttl=exp - time.time())
+    
+    return payload
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user from JWT token"""
-    token = credentials.credentials
-    
+def get_token_user_id(token: str) -> int:
+    """Verify an access token and return the user ID it was issued for"""
     # Decodificar el token (esto ya maneja las excepciones)
     payload = decode_token(token)
     
@@ -71,16 +92,94 @@ def get_current_user(
     
     # Convertir sub (string) a int
     try:
-        user_id = int(user_id_str)
+        return int(user_id_str)
     except (ValueError, TypeError):
         raise UnauthorizedException(message="Token inválido: ID de usuario no válido")
+
+
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """Authenticated user resolved from an access token (safe to cache between requests)"""
+    id: int
+    name: str
+    email: str
+
+
+# Cache de usuarios autenticados por ID: evita un SELECT por request
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE if settings.USER_CACHE_ENABLED else 0,
+    ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+# Usuarios modificados en la transacción de la sesión, a quitar del cache al confirmar
+CHANGED_USERS_KEY = "changed_user_ids"
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _track_changed_user(mapper, connection, target: User) -> None:
+    # Se ejecuta en el flush, antes del commit: quitarlo ya dejaría que otra
+    # request vuelva a cachear la fila vieja todavía confirmada
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(CHANGED_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session: Session) -> None:
+    # Solo este proceso: en los demás workers el cambio se ve al expirar el TTL
+    for user_id in session.info.pop(CHANGED_USERS_KEY, ()):
+        user_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop(CHANGED_USERS_KEY, None)
+
+
+def _authenticated_user(user: User) -> AuthenticatedUser:
+    cached = AuthenticatedUser(id=user.id, name=user.name, email=user.email)
+    user_cache.set(user.id, cached)
+    return cached
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> AuthenticatedUser:
+    """Get current authenticated user from JWT token"""
+    user_id = get_token_user_id(credentials.credentials)
+    
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
     
     # Buscar usuario en la base de datos
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise UnauthorizedException(message="Usuario no encontrado")
     
-    return user
+    return _authenticated_user(user)
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthenticatedUser:
+    """Get current authenticated user from JWT token (async database session)"""
+    user_id = get_token_user_id(credentials.credentials)
+    
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        return cached
+    
+    # Buscar usuario en la base de datos
+    user = await db.get(User, user_id)
+    if user is None:
+        raise UnauthorizedException(message="Usuario no encontrado")
+    
+    return _authenticated_user(user)
 
 
 def verify_refresh_token(token: str) -> Dict[str, Any]:
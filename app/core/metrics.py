@@ -0,0 +1,179 @@
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Buckets en segundos para la latencia y en bytes para el tamaño de respuesta
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Ruta de las peticiones que no coinciden con ninguna ruta (evita una serie por URL)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """Prometheus-style histogram: per-bucket counts, sum and count"""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # el último es +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, ending with +Inf"""
+        result, total = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append(("+Inf" if bound == float("inf") else format_value(bound), total))
+        return result
+
+
+class RequestMetrics:
+    """
+    Per-process HTTP metrics. Only the event loop thread touches them (the
+    ASGI middleware and the /metrics endpoint; sync routes run only their
+    handler in the threadpool), so plain ints and dicts need no locks.
+    """
+
+    def __init__(self):
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.response_size: Dict[Tuple[str, str], Histogram] = {}
+        self.in_progress = 0
+
+    def record(self, method: str, route: str, status: int, duration: float, size: int) -> None:
+        key = (method, route)
+        status_key = (method, route, status)
+        self.requests[status_key] = self.requests.get(status_key, 0) + 1
+
+        latency = self.latency.get(key)
+        if latency is None:
+            latency = self.latency[key] = Histogram(LATENCY_BUCKETS)
+        latency.observe(duration)
+
+        response_size = self.response_size.get(key)
+        if response_size is None:
+            response_size = self.response_size[key] = Histogram(SIZE_BUCKETS)
+        response_size.observe(size)
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = [
+            "# HELP http_requests_total Total HTTP requests by route and status code.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (method, route, status), count in sorted(self.requests.items()):
+            lines.append(f"http_requests_total{labels(method=method, route=route, status=status)} {count}")
+
+        render_histograms(
+            lines, "http_request_duration_seconds", "HTTP request latency in seconds by route.", self.latency
+        )
+        render_histograms(
+            lines, "http_response_size_bytes", "HTTP response body size in bytes by route.", self.response_size
+        )
+
+        lines += [
+            "# HELP http_requests_in_progress HTTP requests being served.",
+            "# TYPE http_requests_in_progress gauge",
+            f"http_requests_in_progress {self.in_progress}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+def format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def labels(**values) -> str:
+    return "{" + ",".join(f'{name}="{escape_label(value)}"' for name, value in values.items()) + "}"
+
+
+def render_histograms(lines: list, name: str, help_text: str, histograms: Dict[Tuple[str, str], Histogram]) -> None:
+    lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for (method, route), histogram in sorted(histograms.items()):
+        for le, count in histogram.cumulative():
+            lines.append(f"{name}_bucket{labels(method=method, route=route, le=le)} {count}")
+        lines.append(f"{name}_sum{labels(method=method, route=route)} {format_value(histogram.sum)}")
+        lines.append(f"{name}_count{labels(method=method, route=route)} {histogram.count}")
+
+
+metrics = RequestMetrics()
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that served the request (e.g. /api/v1/tasks/{task_id}),
+    so metrics have one series per route instead of one per URL
+    """
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return UNMATCHED_ROUTE
+
+    for route in app.router.routes:
+        if getattr(route, "endpoint", None) is endpoint:
+            methods = getattr(route, "methods", None)
+            if not methods or scope["method"] in methods:
+                return route.path
+    return UNMATCHED_ROUTE
+
+
+_route_labels: Dict[Tuple[object, str], str] = {}
+
+
+def route_label(scope) -> str:
+    """route_template() cached per (endpoint, method), for the per-request middlewares"""
+    key = (scope.get("endpoint"), scope["method"])
+    label = _route_labels.get(key)
+    if label is None:
+        label = _route_labels[key] = route_template(scope)
+    return label
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency, status, in-flight requests and
+    response size (BaseHTTPMiddleware would add a task and a stream per request)
+    """
+
+    def __init__(self, app, registry: Optional[RequestMetrics] = None):
+        self.app = app
+        self.registry = registry or metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        registry = self.registry
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        registry.in_progress += 1
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            registry.in_progress -= 1
+            registry.record(
+                scope["method"], route_label(scope), status, time.perf_counter() - started, size
+            )
@@ -0,0 +1,78 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, tuple_
+
+from app.core.exceptions import BadRequestException
+
+
+def encode_cursor(sort_by: str, order: str, value: Any, last_id: int) -> str:
+    """Encode the position of the last row of a page as an opaque cursor"""
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    raw = json.dumps([sort_by, order, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> Tuple[Any, int]:
+    """Decode a cursor and return (sort_value, last_id)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort_by, cursor_order, value, last_id = json.loads(
+            base64.urlsafe_b64decode(padded.encode("ascii"))
+        )
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+        last_id = int(last_id)
+    except (ValueError, TypeError, KeyError, binascii.Error, UnicodeError):
+        raise BadRequestException(message="Cursor de paginación inválido")
+
+    # Un cursor solo es válido para el mismo orden con el que fue generado
+    if cursor_sort_by != sort_by or cursor_order != order:
+        raise BadRequestException(
+            message="El cursor no corresponde al ordenamiento solicitado (sort_by/order)"
+        )
+
+    return value, last_id
+
+
+def keyset_order_by(sort_column, id_column, descending: bool) -> List[Any]:
+    """
+    ORDER BY clauses for keyset pagination: (sort_column, id), with NULL sorting
+    as the largest value (PostgreSQL's default: NULLS LAST ascending, NULLS FIRST
+    descending), so one (user_id, sort_column, id) index serves both directions.
+    """
+    if descending:
+        return [sort_column.desc().nulls_first(), id_column.desc()]
+    return [sort_column.asc().nulls_last(), id_column.asc()]
+
+
+def keyset_after(sort_column, id_column, descending: bool, value: Any, last_id: int, nullable: bool = True):
+    """
+    WHERE criterion selecting the rows that come after (value, last_id).
+    For NOT NULL columns (nullable=False) it is a plain row comparison that
+    maps to a single index range scan.
+    """
+    if value is None:
+        # Estamos dentro del bloque de NULLs: desempatar por id
+        if descending:
+            # DESC: los NULLs van primero, después vienen todos los valores
+            return or_(and_(sort_column.is_(None), id_column < last_id), sort_column.isnot(None))
+        return and_(sort_column.is_(None), id_column > last_id)
+
+    if descending:
+        # Los NULLs ya se recorrieron (van primero) y la comparación los excluye
+        return tuple_(sort_column, id_column) < tuple_(value, last_id)
+
+    seek = tuple_(sort_column, id_column) > tuple_(value, last_id)
+    return or_(seek, sort_column.is_(None)) if nullable else seek
+
+
+def page_rows(rows: list, limit: Optional[int]) -> Tuple[list, bool]:
+    """Trim a result fetched with limit + 1 and report whether more rows exist"""
+    if limit is None or len(rows) <= limit:
+        return rows, False
+    return rows[:limit], True
@@ -0,0 +1,155 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+from app.core.metrics import route_label
+
+sql_logger = logging.getLogger("app.sql")
+request_logger = logging.getLogger("app.requests")
+
+# Largo máximo de las sentencias que se escriben en los logs
+LOGGED_STATEMENT_MAX_LENGTH = 1000
+
+
+class QueryStats:
+    """Statements and DB time of one request (shapes only in debug, for the N+1 check)"""
+
+    __slots__ = ("count", "duration", "shapes")
+
+    def __init__(self, track_shapes: bool = False):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Optional[Counter] = Counter() if track_shapes else None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.duration += elapsed
+        if self.shapes is not None:
+            # Los valores van como parámetros: el texto de la sentencia es su forma
+            self.shapes[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least `threshold` times (likely N+1)"""
+        if self.shapes is None:
+            return []
+        return [(statement, count) for statement, count in self.shapes.most_common() if count >= threshold]
+
+
+# Estadísticas de la request en curso; el threadpool de las rutas sync y los
+# greenlets de AsyncSession.run_sync heredan el contexto
+request_queries: ContextVar[Optional[QueryStats]] = ContextVar("request_queries", default=None)
+
+
+def log_event(logger: logging.Logger, level: int, event_name: str, **fields) -> None:
+    """One JSON object per line, easy to ship to a log aggregator"""
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps({"event": event_name, **fields}, ensure_ascii=False, default=str))
+
+
+def truncate_statement(statement: str) -> str:
+    statement = " ".join(statement.split())
+    if len(statement) > LOGGED_STATEMENT_MAX_LENGTH:
+        return statement[:LOGGED_STATEMENT_MAX_LENGTH] + "..."
+    return statement
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany) -> None:
+    context._query_started = time.perf_counter()
+
+
+def _record_query(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+
+    stats = request_queries.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        log_event(
+            sql_logger, logging.WARNING, "slow_query",
+            duration_ms=round(elapsed * 1000, 2),
+            statement=truncate_statement(statement)
+        )
+
+
+def instrument_engines() -> None:
+    """Time every statement of every engine (primary, replica, sync and async)"""
+    if not event.contains(Engine, "before_cursor_execute", _start_query_timer):
+        event.listen(Engine, "before_cursor_execute", _start_query_timer)
+        event.listen(Engine, "after_cursor_execute", _record_query)
+
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    return (
+        f'db;dur={stats.duration * 1000:.2f};desc="{stats.count} queries", '
+        f"app;dur={elapsed * 1000:.2f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """
+    Per-request SQL statistics: Server-Timing header (db time and statement
+    count), one structured log line per request and, with DEBUG, a warning
+    for statement shapes repeated N_PLUS_ONE_THRESHOLD times or more
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(track_shapes=settings.DEBUG)
+        token = request_queries.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing(stats, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_queries.reset(token)
+            self.report(scope, stats, status, time.perf_counter() - started)
+
+    def report(self, scope, stats: QueryStats, status: int, elapsed: float) -> None:
+        route = route_label(scope)
+
+        log_event(
+            request_logger, logging.INFO, "request",
+            method=scope["method"],
+            route=route,
+            path=scope["path"],
+            status=status,
+            duration_ms=round(elapsed * 1000, 2),
+            db_queries=stats.count,
+            db_time_ms=round(stats.duration * 1000, 2)
+        )
+
+        for statement, count in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+            log_event(
+                sql_logger, logging.WARNING, "repeated_query",
+                method=scope["method"],
+                route=route,
+                count=count,
+                statement=truncate_statement(statement)
+            )
@@ -0,0 +1,100 @@
+"""
+Read routing for task GET routes: a user's reads go to the replica
+(DATABASE_REPLICA_URL) only when it has already replayed all of that user's
+writes, so nobody sees their own changes vanish, whichever worker or pod
+serves the read.
+
+Every task write bumps the user's data version (user_data_versions) in its
+own transaction. The routing reads that version on the primary (a primary
+key lookup) and on the replica, and uses the replica only if its version is
+at least as high; otherwise the read stays on the primary. The version of
+the chosen database is kept for the ETag check (routed_data_version), so the
+ETag, the list cache and the calendar cache never go back to an older
+version after a write.
+"""
+import threading
+from collections import Counter
+from typing import Optional
+
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import AsyncReplicaSessionLocal, ReplicaSessionLocal, get_async_db, get_db
+from app.core.jwt import AuthenticatedUser, get_current_user, get_current_user_async
+from app.services.tasks import data_version
+
+# Lecturas servidas por la réplica, y por el primario porque la réplica estaba atrasada
+routing_counts: Counter = Counter()
+_routing_lock = threading.Lock()
+
+
+def count_route(target: str) -> None:
+    with _routing_lock:
+        routing_counts[target] += 1
+
+
+def routing_stats() -> dict:
+    with _routing_lock:
+        return {"replica": routing_counts["replica"], "replica_behind": routing_counts["replica_behind"]}
+
+
+def routed_data_version(request: Request) -> Optional[int]:
+    """Data version read while routing this request (None without a replica)"""
+    return getattr(request.state, "data_version", None)
+
+
+def get_read_db(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Session for read-only routes: the replica if it is up to date for the user, else the primary's"""
+    if ReplicaSessionLocal is None:
+        yield db
+        return
+
+    replica = ReplicaSessionLocal()
+    try:
+        primary_version = data_version(db, current_user.id)
+        replica_version = data_version(replica, current_user.id)
+
+        if replica_version >= primary_version:
+            # Devolver al pool la conexión del primario durante el resto de la request
+            db.rollback()
+            count_route("replica")
+            request.state.data_version = replica_version
+            yield replica
+        else:
+            replica.close()
+            count_route("replica_behind")
+            request.state.data_version = primary_version
+            yield db
+    finally:
+        replica.close()
+
+
+async def get_read_async_db(
+    request: Request,
+    current_user: AuthenticatedUser = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Async version of get_read_db"""
+    if AsyncReplicaSessionLocal is None:
+        yield db
+        return
+
+    async with AsyncReplicaSessionLocal() as replica:
+        primary_version = await db.run_sync(data_version, current_user.id)
+        replica_version = await replica.run_sync(data_version, current_user.id)
+
+        if replica_version >= primary_version:
+            await db.rollback()
+            count_route("replica")
+            request.state.data_version = replica_version
+            yield replica
+        else:
+            await replica.close()
+            count_route("replica_behind")
+            request.state.data_version = primary_version
+            yield db
@@ -1,6 +1,15 @@
-from typing import Any, Optional, TypeVar, Generic
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Mapping, Optional, TypeVar, Generic
+from fastapi import Response
 from pydantic import BaseModel
 
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa json de la stdlib
+    orjson = None
+
 T = TypeVar('T')
 
 
@@ -20,13 +29,18 @@ class APIResponse(BaseModel, Generic[T]):
         }
 
 
-def success_response(message: str = "Success", data: Any = None) -> dict:
-    """Helper function to create success responses"""
-    return {
+def success_response(message: str = "Success", data: Any = None, **extra: Any) -> dict:
+    """
+    Helper function to create success responses.
+    Extra keyword arguments (e.g. next_cursor) are added to the envelope.
+    """
+    response = {
         "success": True,
         "message": message,
         "data": data
     }
+    response.update(extra)
+    return response
 
 
 def error_response(message: str = "Error", data: Any = None) -> dict:
@@ -36,3 +50,47 @@ def error_response(message: str = "Error", data: Any = None) -> dict:
         "message": message,
         "data": data
     }
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the non-JSON types used in responses the same way jsonable_encoder does"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dump_json(content: Any) -> bytes:
+    """
+    Serialize to the same bytes FastAPI's JSONResponse produces (compact
+    separators, UTF-8, ISO datetimes) in one pass, without jsonable_encoder.
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_json_default)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_json_default
+    ).encode("utf-8")
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    Raw JSON Response for a success_response() envelope (fast path for large
+    payloads). Returning a Response skips the route's status_code and the
+    headers set on the injected Response, so pass them here.
+    """
+    return raw_json_response(dump_json(content), status_code, headers)
+
+
+def raw_json_response(body: bytes, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """JSON Response for an already serialized body (e.g. from a result cache)"""
+    return Response(
+        content=body,
+        status_code=status_code,
+        headers=dict(headers) if headers is not None else None,
+        media_type="application/json"
+    )
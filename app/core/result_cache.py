@@ -0,0 +1,291 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # redis es opcional: solo hace falta con el backend "redis"
+    redis = None
+
+logger = logging.getLogger("app.cache")
+
+# Timeout de conexión y lectura de Redis: un cache lento no debe frenar las requests
+REDIS_TIMEOUT_SECONDS = 0.5
+
+
+class LocalBackend:
+    """
+    In-process LRU of namespaces (one per user), each a small dict of
+    field -> bytes, bounded by total bytes. Thread-safe (sync routes run
+    in the threadpool); per process, like the other in-memory caches.
+    """
+
+    blocking = False
+
+    def __init__(self, max_bytes: int, ttl: float, max_fields: int, timer: Callable[[], float] = time.monotonic):
+        # Con 0 campos por namespace no hay lugar para ninguna entrada
+        if max_fields < 1:
+            raise ValueError(
+                "El cache necesita al menos 1 entrada por usuario (*_MAX_PER_USER >= 1); "
+                "para desactivarlo usar su variable *_ENABLED=false"
+            )
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_fields = max_fields
+        self.timer = timer
+        self.size = 0
+        self._data: "OrderedDict[Any, Tuple[float, Dict[str, bytes]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: Any, field: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(namespace)
+            if entry is None:
+                return None
+            expires_at, fields = entry
+            if expires_at <= self.timer():
+                self._drop(namespace)
+                return None
+            self._data.move_to_end(namespace)
+            return fields.get(field)
+
+    def set(self, namespace: Any, field: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            entry = self._data.get(namespace)
+            if entry is None or entry[0] <= self.timer():
+                if entry is not None:
+                    self._drop(namespace)
+                fields: Dict[str, bytes] = {}
+                self._data[namespace] = (self.timer() + self.ttl, fields)
+            else:
+                fields = entry[1]
+                self._data.move_to_end(namespace)
+
+            previous = fields.pop(field, None)
+            if previous is not None:
+                self.size -= len(previous)
+            # Por namespace se descarta el campo más viejo
+            while len(fields) >= self.max_fields:
+                self.size -= len(fields.pop(next(iter(fields))))
+            fields[field] = value
+            self.size += len(value)
+
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._data)))
+
+    def delete(self, namespace: Any) -> None:
+        with self._lock:
+            if namespace in self._data:
+                self._drop(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "local",
+            "namespaces": len(self._data),
+            "entries": sum(len(fields) for _, fields in self._data.values()),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+        }
+
+    def _drop(self, namespace: Any) -> None:
+        _, fields = self._data.pop(namespace)
+        self.size -= sum(len(value) for value in fields.values())
+
+
+class KeyValueBackend:
+    """
+    External key-value store shared by every process: one Redis hash per
+    namespace (HGET / HSET + EXPIRE / DEL). Store errors are logged and
+    treated as misses, so an outage of the cache never fails a request.
+    """
+
+    blocking = True
+
+    def __init__(self, client, ttl: float, prefix: str):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self.errors = 0
+
+    def key(self, namespace: Any) -> str:
+        return f"{self.prefix}:{namespace}"
+
+    def get(self, namespace: Any, field: str) -> Optional[bytes]:
+        try:
+            return self.client.hget(self.key(namespace), field)
+        except Exception as exc:
+            self._error("get", exc)
+            return None
+
+    def set(self, namespace: Any, field: str, value: bytes) -> None:
+        key = self.key(namespace)
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            pipeline.hset(key, field, value)
+            pipeline.expire(key, int(self.ttl))
+            pipeline.execute()
+        except Exception as exc:
+            self._error("set", exc)
+
+    def delete(self, namespace: Any) -> None:
+        try:
+            self.client.delete(self.key(namespace))
+        except Exception as exc:
+            self._error("delete", exc)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": type(self.client).__name__, "ttl_seconds": self.ttl, "errors": self.errors}
+
+    def _error(self, operation: str, exc: Exception) -> None:
+        self.errors += 1
+        logger.warning("Result cache %s failed: %s", operation, exc)
+
+
+class MemoryKeyValueStore:
+    """
+    Local stand-in for the Redis client used by KeyValueBackend (the hash,
+    expire, delete and pipeline commands it needs), to exercise that backend
+    in tests and development without a server
+    """
+
+    def __init__(self, timer: Callable[[], float] = time.monotonic):
+        self.timer = timer
+        self._data: Dict[str, Tuple[Optional[float], Dict[str, bytes]]] = {}
+        self._lock = threading.Lock()
+
+    def hget(self, key: str, field: str) -> Optional[bytes]:
+        with self._lock:
+            fields = self._live(key)
+            return fields.get(field) if fields is not None else None
+
+    def hset(self, key: str, field: str, value: bytes) -> int:
+        with self._lock:
+            fields = self._live(key)
+            if fields is None:
+                fields = {}
+                self._data[key] = (None, fields)
+            created = field not in fields
+            fields[field] = value
+            return int(created)
+
+    def expire(self, key: str, seconds: int) -> bool:
+        with self._lock:
+            fields = self._live(key)
+            if fields is None:
+                return False
+            self._data[key] = (self.timer() + seconds, fields)
+            return True
+
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(self._data.pop(key, None) is not None for key in keys)
+
+    def pipeline(self, transaction: bool = True) -> "MemoryPipeline":
+        return MemoryPipeline(self)
+
+    def _live(self, key: str) -> Optional[Dict[str, bytes]]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, fields = entry
+        if expires_at is not None and expires_at <= self.timer():
+            del self._data[key]
+            return None
+        return fields
+
+
+class MemoryPipeline:
+    def __init__(self, store: MemoryKeyValueStore):
+        self.store = store
+        self.commands: list = []
+
+    def __getattr__(self, name: str):
+        def queue(*args):
+            self.commands.append((name, args))
+            return self
+        return queue
+
+    def execute(self) -> list:
+        commands, self.commands = self.commands, []
+        return [getattr(self.store, name)(*args) for name, args in commands]
+
+
+class ResultCache:
+    """
+    Serialized responses by (namespace, key, data version). The version is
+    part of every entry, so a write makes older entries unreachable even in
+    other processes; invalidate() also frees them right away.
+    """
+
+    def __init__(self, backend, max_entry_bytes: int, enabled: bool = True):
+        self.backend = backend
+        self.max_entry_bytes = max_entry_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def blocking(self) -> bool:
+        """True when calls do network I/O (async routes run them in the threadpool)"""
+        return self.enabled and self.backend.blocking
+
+    def get(self, namespace: Any, version: int, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        value = self.backend.get(namespace, f"{version}:{key}")
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, namespace: Any, version: int, key: str, value: bytes) -> None:
+        # Las respuestas muy grandes ocuparían el cache con pocas entradas
+        if self.enabled and len(value) <= self.max_entry_bytes:
+            self.backend.set(namespace, f"{version}:{key}", value)
+
+    def invalidate(self, namespace: Any) -> None:
+        if self.enabled:
+            self.backend.delete(namespace)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            **self.backend.stats(),
+        }
+
+
+def build_result_cache(
+    enabled: bool,
+    backend: str,
+    url: Optional[str],
+    ttl: float,
+    max_bytes: int,
+    max_fields: int,
+    max_entry_bytes: int,
+    prefix: str
+) -> ResultCache:
+    """Cache with the configured backend: "local" (in-process LRU), "redis" (url) or "memory" (KV stand-in)"""
+    if backend == "local":
+        return ResultCache(LocalBackend(max_bytes, ttl, max_fields), max_entry_bytes, enabled)
+    if backend == "memory":
+        return ResultCache(KeyValueBackend(MemoryKeyValueStore(), ttl, prefix), max_entry_bytes, enabled)
+    if backend == "redis":
+        if redis is None:
+            raise RuntimeError("El backend de cache 'redis' requiere el paquete redis (pip install redis)")
+        if not url:
+            raise RuntimeError("El backend de cache 'redis' requiere la URL del servidor")
+        client = redis.Redis.from_url(
+            url, socket_timeout=REDIS_TIMEOUT_SECONDS, socket_connect_timeout=REDIS_TIMEOUT_SECONDS
+        )
+        return ResultCache(KeyValueBackend(client, ttl, prefix), max_entry_bytes, enabled)
+    raise RuntimeError(f"Backend de cache desconocido: {backend} (local, redis o memory)")
@@ -1,5 +1,13 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
 import bcrypt
 
+from app.core.config import settings
+from app.core.exceptions import ServiceUnavailableException
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against a hashed password"""
@@ -14,3 +22,41 @@ def get_password_hash(password: str) -> str:
     salt = bcrypt.gensalt()
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     return hashed.decode('utf-8')
+
+
+# Pool dedicado para bcrypt (~250 ms de CPU por llamada; bcrypt libera el GIL).
+# Acota cuántos hashes corren y esperan a la vez: con la cola llena se responde
+# 503 de inmediato, así un pico de logins no acapara el resto de la API.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_password_slots = threading.BoundedSemaphore(
+    settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_DEPTH
+)
+
+
+def _submit_password_job(fn: Callable[..., Any], *args: Any) -> Future:
+    if not _password_slots.acquire(blocking=False):
+        raise ServiceUnavailableException(
+            message="Demasiadas solicitudes de autenticación. Intente nuevamente en unos segundos.",
+            retry_after=1
+        )
+    
+    future = _password_executor.submit(fn, *args)
+    future.add_done_callback(lambda _: _password_slots.release())
+    return future
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the dedicated hashing pool without blocking the event loop"""
+    return await asyncio.wrap_future(_submit_password_job(verify_password, plain_password, hashed_password))
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the dedicated hashing pool without blocking the event loop"""
+    return await asyncio.wrap_future(_submit_password_job(get_password_hash, password))
+
+
+def shutdown_password_pool() -> None:
+    _password_executor.shutdown(wait=False, cancel_futures=True)
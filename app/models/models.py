@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Computed, Index, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -7,7 +8,7 @@ from app.core.database import Base
 class User(Base):
     __tablename__ = "users"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(255), nullable=False)
     email = Column(String(255), unique=True, index=True, nullable=False)
     hashed_password = Column(String(255), nullable=False)
@@ -20,8 +21,20 @@ class User(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Todas las consultas filtran primero por user_id: índices compuestos
+        # (user_id, columna[, id]) que sirven el filtro y el orden keyset
+        Index("ix_tasks_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_id_start_date", "user_id", "start_date", "id"),
+        Index("ix_tasks_user_id_deadline", "user_id", "deadline", "id"),
+        Index("ix_tasks_user_id_status", "user_id", "status", "id"),
+        Index("ix_tasks_user_id_category", "user_id", "category"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    # No traer columnas generadas (search_vector) en el RETURNING de cada INSERT/UPDATE
+    __mapper_args__ = {"eager_defaults": False}
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     category = Column(String(100), nullable=True, index=True)
@@ -30,9 +43,49 @@ class Task(Base):
     deadline = Column(DateTime(timezone=True), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Cuándo pasó a "completado" (NULL mientras no lo esté); lo usa /tasks/stats
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Búsqueda full-text (columna generada + índice GIN); deferred: no se
+    # carga con la tarea, solo se usa en el WHERE / ranking de búsquedas
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('spanish', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('spanish', coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True
+        )
+    ))
     
     # Foreign key
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Relación con usuario
     owner = relationship("User", back_populates="tasks")
+
+
+class TaskCategoryCount(Base):
+    """
+    Per-user task count by category, maintained incrementally by the task
+    write paths (app/services/tasks.py) so GET /tasks/categories is a primary
+    key lookup instead of a GROUP BY over all of the user's tasks.
+    """
+    __tablename__ = "task_category_counts"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    category = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class UserDataVersion(Base):
+    """
+    Per-user task data version: incremented in the same transaction as every
+    task write, so clients can revalidate reads with ETag / If-None-Match.
+    A user without a row is at version 0.
+    """
+    __tablename__ = "user_data_versions"
+    
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
@@ -116,6 +116,33 @@ class TaskBulkCreate(BaseModel):
     tasks: list[TaskCreate] = Field(..., min_length=1)
 
 
+class TaskFilterSet(BaseModel):
+    """Same filters as the GET /tasks query parameters (all optional, combined with AND)"""
+    status: Optional[TaskStatus] = None
+    category: Optional[str] = None
+    start_date_from: Optional[datetime] = None
+    start_date_to: Optional[datetime] = None
+    deadline_from: Optional[datetime] = None
+    deadline_to: Optional[datetime] = None
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+    search: Optional[str] = None
+
+
+class TaskBulkSelection(BaseModel):
+    """Tasks targeted by a bulk operation: a list of ids or a filter (exactly one)"""
+    ids: Optional[list[int]] = Field(None, min_length=1, description="IDs de las tareas", examples=[[1, 2, 3]])
+    filter: Optional[TaskFilterSet] = Field(None, description="Filtros de GET /tasks; {} selecciona todas las tareas")
+
+
+class TaskBulkUpdate(TaskBulkSelection):
+    changes: TaskUpdate
+
+
+class TaskBulkDelete(TaskBulkSelection):
+    pass
+
+
 class CategoryResponse(BaseModel):
     category: str
     count: int
@@ -0,0 +1,297 @@
+import codecs
+import csv
+import io
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only, greenlet_spawn
+
+from app.core.exceptions import BadRequestException
+from app.models.models import Task
+from app.schemas.schemas import TaskCreate
+from app.services.tasks import adjust_category_counts, bump_data_version, category_deltas, task_values
+
+# Importación en streaming de tareas (CSV / NDJSON) cargadas con COPY.
+# El cuerpo se procesa registro a registro y se escribe en bloques acotados,
+# de modo que la memoria no depende del tamaño del archivo.
+
+CSV_CONTENT_TYPES = {"text/csv", "application/csv"}
+NDJSON_CONTENT_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines"}
+
+COPY_COLUMNS = ["title", "description", "category", "status", "start_date", "deadline", "completed_at", "user_id"]
+
+# Campos opcionales: en CSV una celda vacía significa "sin valor"
+OPTIONAL_FIELDS = {"description", "category", "status", "start_date", "deadline"}
+
+# Longitud máxima de una línea o registro (el mismo límite por campo del módulo csv).
+# Un registro más largo (p. ej. comillas sin cerrar) se reporta como error de esa
+# fila y el análisis continúa en la línea siguiente.
+MAX_RECORD_CHARS = 128 * 1024
+RECORD_TOO_LONG = f"Registro demasiado largo (máximo {MAX_RECORD_CHARS} caracteres)"
+
+
+class RecordTooLong(Exception):
+    pass
+
+
+def import_format(content_type: Optional[str]) -> str:
+    """Resolve the import format ('csv' or 'ndjson') from the request Content-Type"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    raise BadRequestException(
+        message="Content-Type no soportado. Use text/csv o application/x-ndjson"
+    )
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Split a streamed UTF-8 body into lines (a leading BOM is ignored).
+    A line longer than MAX_RECORD_CHARS is skipped and yielded as None, so
+    a body without newlines is never buffered whole.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    overlong = False
+    async for chunk in stream:
+        try:
+            pending += decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise BadRequestException(message="El archivo debe estar codificado en UTF-8")
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if overlong or len(line) > MAX_RECORD_CHARS:
+                # El resto de una línea ya descartada también cuenta como esa línea
+                overlong = False
+                yield None
+            else:
+                yield line
+        if len(pending) > MAX_RECORD_CHARS:
+            overlong, pending = True, ""
+    pending += decoder.decode(b"", final=True)
+    if overlong or len(pending) > MAX_RECORD_CHARS:
+        yield None
+    elif pending:
+        yield pending
+
+
+class CsvLineFeed:
+    """
+    Line iterator for csv.reader over the async lines of iter_lines. It is
+    synchronous, so it must be consumed inside greenlet_spawn (each line is
+    awaited with await_only). Counts the lines read and raises RecordTooLong
+    once the record being parsed exceeds MAX_RECORD_CHARS.
+    """
+
+    def __init__(self, lines: AsyncIterator[Optional[str]]):
+        self.lines = lines
+        self.line_number = 0
+        self.record_chars = 0
+        self.exhausted = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        try:
+            line = await_only(self.lines.__anext__())
+        except StopAsyncIteration:
+            self.exhausted = True
+            raise StopIteration
+        self.line_number += 1
+        if line is None:
+            raise RecordTooLong
+        self.record_chars += len(line) + 1
+        if self.record_chars > MAX_RECORD_CHARS:
+            raise RecordTooLong
+        return line + "\n"
+
+
+async def iter_csv_records(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[Tuple[int, Any]]:
+    """
+    Yield (line_number, record) from CSV lines; the first line is the header
+    and line_number is the file line where the record starts. All lines go
+    through a single csv.reader, so quoted fields may span several lines
+    and a malformed or overlong record is reported on its own: parsing
+    resumes on the next line.
+    """
+    feed = CsvLineFeed(lines)
+    reader = csv.reader(feed, strict=True)
+    header = None
+    while True:
+        line_number = feed.line_number + 1
+        feed.record_chars = 0
+        try:
+            values = await greenlet_spawn(next, reader, None)
+        except RecordTooLong:
+            yield line_number, RECORD_TOO_LONG
+            continue
+        except csv.Error as exc:
+            yield line_number, "Registro incompleto: comillas sin cerrar" if feed.exhausted else f"CSV inválido: {exc}"
+            continue
+        if values is None:
+            return
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_number, f"Se esperaban {len(header)} columnas y se recibieron {len(values)}"
+            continue
+        yield line_number, {
+            name: (value if value != "" or name not in OPTIONAL_FIELDS else None)
+            for name, value in zip(header, values)
+        }
+
+
+async def iter_ndjson_records(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield (line_number, record) from NDJSON lines (one JSON object per line)"""
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if line is None:
+            yield line_number, RECORD_TOO_LONG
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_number, "JSON inválido"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, "Cada línea debe ser un objeto JSON"
+            continue
+        yield line_number, record
+
+
+def validate_record(record: Dict[str, Any]) -> Tuple[Optional[TaskCreate], List[str]]:
+    """Validate one imported record against the TaskCreate rules"""
+    # status vacío -> valor por defecto del schema
+    if record.get("status") is None:
+        record.pop("status", None)
+    try:
+        return TaskCreate.model_validate(record), []
+    except ValidationError as exc:
+        return None, [
+            f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        ]
+
+
+def copy_text_value(value: Any) -> str:
+    """Encode a value for COPY ... FROM STDIN (text format)"""
+    if value is None:
+        return "\\N"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def copy_tasks(db: Session, rows: List[dict]) -> int:
+    """
+    Load task rows with COPY FROM STDIN and commit.
+    Uses psycopg2's copy_expert or asyncpg's copy_records_to_table (when called
+    through AsyncSession.run_sync); other databases fall back to executemany.
+    """
+    if not rows:
+        return 0
+
+    connection = db.connection()
+    driver_connection = connection.connection.driver_connection
+
+    if connection.dialect.driver == "psycopg2":
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write("\t".join(copy_text_value(row[column]) for column in COPY_COLUMNS))
+            buffer.write("\n")
+        buffer.seek(0)
+        with driver_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {Task.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN",
+                buffer
+            )
+    elif connection.dialect.driver == "asyncpg":
+        await_only(driver_connection.copy_records_to_table(
+            Task.__tablename__,
+            records=[tuple(row[column] for column in COPY_COLUMNS) for row in rows],
+            columns=COPY_COLUMNS
+        ))
+    else:
+        db.execute(insert(Task.__table__), rows)
+
+    # Todas las filas de una importación pertenecen al mismo usuario
+    user_id = rows[0]["user_id"]
+    adjust_category_counts(db, user_id, category_deltas(rows))
+    bump_data_version(db, user_id)
+    db.commit()
+    return len(rows)
+
+
+class ImportResult:
+    """Running totals of a streamed import; keeps at most max_errors row errors"""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[dict] = []
+
+    def add_error(self, row_number: int, errors: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def as_dict(self) -> dict:
+        return {
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def import_records(records: AsyncIterator[Tuple[int, Any]], user_id: int, chunk_size: int, max_errors: int, load_chunk) -> ImportResult:
+    """
+    Validate streamed records and hand valid rows to `load_chunk` (an async
+    callable receiving a list of row dicts) every `chunk_size` rows.
+    """
+    result = ImportResult(max_errors)
+    chunk: List[dict] = []
+
+    async for row_number, record in records:
+        if isinstance(record, str):
+            result.add_error(row_number, [record])
+            continue
+
+        task_data, errors = validate_record(record)
+        if errors:
+            result.add_error(row_number, errors)
+            continue
+
+        chunk.append(task_values(task_data, user_id))
+        if len(chunk) >= chunk_size:
+            result.imported += await load_chunk(chunk)
+            chunk = []
+
+    if chunk:
+        result.imported += await load_chunk(chunk)
+
+    return result
+
+
+def record_stream(fmt: str, stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+    lines = iter_lines(stream)
+    return iter_csv_records(lines) if fmt == "csv" else iter_ndjson_records(lines)
@@ -0,0 +1,885 @@
+import hashlib
+import re
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Iterable, List, NamedTuple, NoReturn, Optional, Tuple
+
+from fastapi import Query
+from sqlalchemy import Float, Integer, any_, case, cast, desc, asc, delete, func, insert, literal, literal_column, select, text, union, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import ARRAY, TSQUERY
+from sqlalchemy.orm import Query as SQLQuery, Session
+
+from app.core.config import settings
+from app.core.exceptions import NotFoundException, ForbiddenException, BadRequestException
+from app.core.pagination import encode_cursor, decode_cursor, keyset_order_by, keyset_after, page_rows
+from app.core.response import dump_json, success_response
+from app.core.result_cache import build_result_cache
+from app.models.models import Task, TaskCategoryCount, UserDataVersion
+from app.schemas.schemas import TaskBulkSelection, TaskCreate, TaskResponse, TaskStatus
+
+# Lógica de acceso a datos de tareas compartida por las rutas síncronas
+# (app/api/tasks.py) y asíncronas (app/api/tasks_async.py, vía AsyncSession.run_sync)
+
+VALID_SORT_FIELDS = {"created_at", "start_date", "deadline", "title", "status", "updated_at"}
+
+# Campos de TaskResponse, en el orden en que se serializan
+TASK_RESPONSE_FIELDS = tuple(TaskResponse.model_fields)
+
+SEARCH_TERM_RE = re.compile(r"\w+")
+
+# Cache del calendario: la respuesta JSON ya serializada por (usuario, año,
+# mes, campos, versión de datos), acotada en bytes. Una entrada solo sirve
+# mientras la versión del usuario no cambie, así que cualquier escritura (en
+# cualquier proceso) la invalida
+calendar_cache = build_result_cache(
+    enabled=settings.CALENDAR_CACHE_ENABLED,
+    backend="local",
+    url=None,
+    ttl=settings.CALENDAR_CACHE_TTL_SECONDS,
+    max_bytes=settings.CALENDAR_CACHE_MAX_BYTES,
+    max_fields=settings.CALENDAR_CACHE_MAX_PER_USER,
+    max_entry_bytes=settings.CALENDAR_CACHE_MAX_ENTRY_BYTES,
+    prefix="tasks:calendar"
+)
+
+# Cache de GET /tasks: el cuerpo JSON ya serializado por (usuario, filtros
+# normalizados, versión de datos). Las rutas de escritura invalidan al usuario
+task_list_cache = build_result_cache(
+    enabled=settings.TASKS_LIST_CACHE_ENABLED,
+    backend=settings.TASKS_LIST_CACHE_BACKEND,
+    url=settings.TASKS_LIST_CACHE_URL,
+    ttl=settings.TASKS_LIST_CACHE_TTL_SECONDS,
+    max_bytes=settings.TASKS_LIST_CACHE_MAX_BYTES,
+    max_fields=settings.TASKS_LIST_CACHE_MAX_PER_USER,
+    max_entry_bytes=settings.TASKS_LIST_CACHE_MAX_ENTRY_BYTES,
+    prefix="tasks:list"
+)
+
+
+def use_full_text_search(db: Session) -> bool:
+    """Full-text search needs PostgreSQL and the tasks.search_vector migration"""
+    return settings.TASKS_FULL_TEXT_SEARCH and db.get_bind().dialect.name == "postgresql"
+
+
+def search_tsquery(search: str):
+    """
+    Prefix tsquery for a free-text search ("informe mens" -> "informe:* & mens:*"),
+    in both the Spanish (stemmed) and simple configurations.
+    Returns None when the text has no searchable words.
+    """
+    terms = SEARCH_TERM_RE.findall(search)
+    if not terms:
+        return None
+    text = " & ".join(f"{term}:*" for term in terms)
+    return func.to_tsquery(literal_column("'spanish'::regconfig"), text).op("||", return_type=TSQUERY)(
+        func.to_tsquery(literal_column("'simple'::regconfig"), text)
+    )
+
+
+def response_fields(fields: Optional[str]) -> Tuple[str, ...]:
+    """
+    Parse a sparse fieldset ("id,title,status") against TaskResponse.
+    Returns the fields in TaskResponse order (all of them if none are given).
+    """
+    if fields is None:
+        return TASK_RESPONSE_FIELDS
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    if not requested:
+        return TASK_RESPONSE_FIELDS
+
+    invalid = requested.difference(TASK_RESPONSE_FIELDS)
+    if invalid:
+        raise BadRequestException(
+            message=f"Campos inválidos en 'fields': {', '.join(sorted(invalid))}. "
+                    f"Campos válidos: {', '.join(TASK_RESPONSE_FIELDS)}"
+        )
+
+    return tuple(field for field in TASK_RESPONSE_FIELDS if field in requested)
+
+
+def task_columns(fields: Tuple[str, ...]) -> list:
+    """Columns to SELECT for a fieldset (id is always loaded, e.g. for the cursor)"""
+    return [getattr(Task, field) for field in TASK_RESPONSE_FIELDS if field in fields or field == "id"]
+
+
+@dataclass
+class TaskFilters:
+    """Filter query parameters shared by the task list endpoints"""
+    status: Optional[TaskStatus] = Query(None, description="Filtrar por estado: planificado, en_progreso, completado")
+    category: Optional[str] = Query(None, description="Filtrar por categoría")
+    start_date_from: Optional[datetime] = Query(None, description="Filtrar tareas con fecha de inicio desde")
+    start_date_to: Optional[datetime] = Query(None, description="Filtrar tareas con fecha de inicio hasta")
+    deadline_from: Optional[datetime] = Query(None, description="Filtrar tareas con deadline desde esta fecha")
+    deadline_to: Optional[datetime] = Query(None, description="Filtrar tareas con deadline hasta esta fecha")
+    created_from: Optional[datetime] = Query(None, description="Filtrar tareas creadas desde esta fecha")
+    created_to: Optional[datetime] = Query(None, description="Filtrar tareas creadas hasta esta fecha")
+    search: Optional[str] = Query(None, description="Buscar en título o descripción")
+
+    def criteria(self, user_id: int, full_text: bool = False) -> list:
+        """
+        Build the SQL WHERE criteria for these filters.
+        With full_text=True, search uses the tasks.search_vector GIN index
+        (PostgreSQL only) instead of ILIKE.
+        """
+        criteria = [Task.user_id == user_id]
+
+        # Apply search filter
+        tsquery = search_tsquery(self.search) if full_text and self.search else None
+        if tsquery is not None:
+            criteria.append(Task.search_vector.bool_op("@@")(tsquery))
+        elif self.search:
+            search_filter = f"%{self.search}%"
+            criteria.append(
+                (Task.title.ilike(search_filter)) |
+                (Task.description.ilike(search_filter))
+            )
+
+        # Apply status filter
+        if self.status:
+            criteria.append(Task.status == self.status.value)
+
+        # Apply category filter
+        if self.category:
+            criteria.append(Task.category == self.category)
+
+        # Apply start_date filters
+        if self.start_date_from:
+            criteria.append(Task.start_date >= self.start_date_from)
+
+        if self.start_date_to:
+            criteria.append(Task.start_date <= self.start_date_to)
+
+        # Apply deadline filters
+        if self.deadline_from:
+            criteria.append(Task.deadline >= self.deadline_from)
+
+        if self.deadline_to:
+            criteria.append(Task.deadline <= self.deadline_to)
+
+        # Apply created_at filters
+        if self.created_from:
+            criteria.append(Task.created_at >= self.created_from)
+
+        if self.created_to:
+            criteria.append(Task.created_at <= self.created_to)
+
+        return criteria
+
+
+@dataclass
+class TaskListParams(TaskFilters):
+    """Filter, sorting and pagination query parameters for GET /tasks"""
+    sort_by: Optional[str] = Query(None, description="Campo por el cual ordenar: created_at, start_date, deadline, title, status, updated_at, relevance (por defecto relevance si hay búsqueda, si no created_at)")
+    order: Optional[str] = Query("desc", description="Orden: asc o desc")
+    limit: Optional[int] = Query(None, ge=1, le=settings.TASKS_PAGE_MAX_LIMIT, description="Cantidad máxima de tareas por página (activa la paginación)")
+    cursor: Optional[str] = Query(None, description="Cursor opaco devuelto en next_cursor para obtener la página siguiente")
+    fields: Optional[str] = Query(None, description="Campos a devolver separados por comas, ej: id,title,status,deadline (por defecto todos)")
+
+
+class TaskListQuery(NamedTuple):
+    query: SQLQuery
+    sort_by: str
+    order: str
+    fields: Tuple[str, ...]
+
+
+class BulkResult(NamedTuple):
+    tasks: list
+    not_found: List[int]
+    forbidden: List[int]
+
+
+class TaskPage(NamedTuple):
+    tasks: list
+    next_cursor: Optional[str]
+    fields: Tuple[str, ...]
+
+
+def counted_category(category: Optional[str]) -> Optional[str]:
+    """Category under which a task is counted (None/'' are not listed in /categories)"""
+    return category or None
+
+
+def upsert_increment(db: Session, table, key_columns: list, column: str, rows: List[dict]) -> None:
+    """
+    Insert rows, or add their `column` value to the existing row with the same
+    key (INSERT ... ON CONFLICT DO UPDATE SET column = column + excluded.column).
+    """
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={column: table.c[column] + statement.excluded[column]}
+        )
+        db.execute(statement, rows)
+        return
+
+    for row in rows:
+        updated = db.execute(
+            table.update()
+            .where(*(key == row[key.key] for key in key_columns))
+            .values({column: table.c[column] + row[column]})
+        ).rowcount
+        if not updated:
+            db.execute(insert(table), row)
+
+
+def adjust_category_counts(db: Session, user_id: int, deltas: Counter) -> None:
+    """
+    Apply {category: delta} to the user's task_category_counts rows inside the
+    current transaction, with an atomic upsert (count = count + delta), and
+    drop the rows that reach zero.
+
+    Rows are locked in category order, so concurrent writes of the same user
+    that touch several categories (two bulk updates, a bulk update and an
+    import) wait for each other instead of deadlocking.
+    """
+    deltas = {category: delta for category, delta in deltas.items() if category and delta}
+    if not deltas:
+        return
+
+    table = TaskCategoryCount.__table__
+    upsert_increment(
+        db, table, [table.c.user_id, table.c.category], "count",
+        [{"user_id": user_id, "category": category, "count": delta} for category, delta in sorted(deltas.items())]
+    )
+
+    # Las filas actualizadas quedan bloqueadas hasta el commit, así que no hay carrera
+    db.execute(
+        delete(table).where(
+            table.c.user_id == user_id,
+            table.c.category.in_(list(deltas)),
+            table.c.count <= 0
+        )
+    )
+
+
+def data_version(db: Session, user_id: int) -> int:
+    """Current task data version of a user (primary key lookup; 0 if never written)"""
+    version = db.query(UserDataVersion.version).filter(UserDataVersion.user_id == user_id).scalar()
+    return version or 0
+
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    """
+    Increment the user's data version inside the current (write) transaction;
+    reads go to the replica only once it has replayed this version
+    """
+    table = UserDataVersion.__table__
+    upsert_increment(db, table, [table.c.user_id], "version", [{"user_id": user_id, "version": 1}])
+
+
+def rebuild_category_counts(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recompute task_category_counts from the tasks table (all users, or one)
+    to repair drift. Does not commit. Returns the number of rows written.
+    """
+    table = TaskCategoryCount.__table__
+
+    if db.get_bind().dialect.name == "postgresql":
+        # Espera a las transacciones que ya ajustaron contadores y bloquea las
+        # nuevas hasta el commit, para que ningún delta se pierda ni se duplique
+        db.execute(text(f"LOCK TABLE {table.name} IN EXCLUSIVE MODE"))
+
+    counted = select(Task.user_id, Task.category, func.count(Task.id)).where(
+        Task.category.isnot(None),
+        Task.category != ''
+    ).group_by(Task.user_id, Task.category)
+    cleared = delete(table)
+
+    if user_id is not None:
+        counted = counted.where(Task.user_id == user_id)
+        cleared = cleared.where(table.c.user_id == user_id)
+
+    db.execute(cleared)
+    return db.execute(
+        insert(table).from_select(["user_id", "category", "count"], counted)
+    ).rowcount
+
+
+@lru_cache(maxsize=1024)
+def _fields_getter(fields: Tuple[str, ...]):
+    getter = attrgetter(*fields)
+    if len(fields) == 1:
+        return lambda task: (getter(task),)
+    return getter
+
+
+def task_response_dict(task, fields: Tuple[str, ...] = TASK_RESPONSE_FIELDS) -> dict:
+    """
+    Same dict as TaskResponse.model_validate(task).model_dump() (restricted to
+    `fields`), read straight from a Task or a result row: values coming from
+    the database are already valid, so they are not validated again.
+    """
+    return dict(zip(fields, _fields_getter(fields)(task)))
+
+
+def task_values(task_data: TaskCreate, user_id: int) -> dict:
+    """Column values for a new task row"""
+    completed = task_data.status == TaskStatus.COMPLETADO
+    return {
+        "title": task_data.title,
+        "description": task_data.description,
+        "category": task_data.category,
+        "status": task_data.status.value,
+        "start_date": task_data.start_date,
+        "deadline": task_data.deadline,
+        "completed_at": datetime.now(timezone.utc) if completed else None,
+        "user_id": user_id
+    }
+
+
+def build_task(task_data: TaskCreate, user_id: int) -> Task:
+    """Build a Task ORM object from its creation schema"""
+    return Task(**task_values(task_data, user_id))
+
+
+def category_deltas(rows: Iterable[dict], sign: int = 1) -> Counter:
+    """Category count deltas for inserted (sign=1) or deleted (sign=-1) task rows"""
+    deltas = Counter()
+    for row in rows:
+        deltas[counted_category(row["category"])] += sign
+    return deltas
+
+
+def create_task(db: Session, user_id: int, task_data: TaskCreate) -> Task:
+    new_task = build_task(task_data, user_id)
+
+    db.add(new_task)
+    adjust_category_counts(db, user_id, Counter({counted_category(new_task.category): 1}))
+    bump_data_version(db, user_id)
+    db.commit()
+    db.refresh(new_task)
+
+    return new_task
+
+
+def create_tasks(db: Session, user_id: int, tasks_data: List[TaskCreate]) -> list:
+    """
+    Insert tasks with multi-row INSERT ... RETURNING statements and return the
+    inserted rows in input order. Each chunk of TASKS_BULK_CHUNK_SIZE tasks is
+    committed in its own transaction.
+    """
+    if len(tasks_data) == 0:
+        raise BadRequestException(message="Debe proporcionar al menos una tarea")
+
+    table = Task.__table__
+    columns = [column for column in table.c if column.key in TaskResponse.model_fields]
+    # executemany + RETURNING: SQLAlchemy lo agrupa en INSERTs multi-fila
+    # (insertmanyvalues) y devuelve las filas en el orden de los parámetros
+    statement = insert(table).returning(*columns, sort_by_parameter_order=True)
+    chunk_size = settings.TASKS_BULK_CHUNK_SIZE
+
+    created = []
+    for start in range(0, len(tasks_data), chunk_size):
+        rows = [task_values(task_data, user_id) for task_data in tasks_data[start:start + chunk_size]]
+        created.extend(db.execute(statement, rows).all())
+        adjust_category_counts(db, user_id, category_deltas(rows))
+        bump_data_version(db, user_id)
+        db.commit()
+
+    return created
+
+
+def list_full_text(db: Session, params: TaskListParams) -> bool:
+    """Whether GET /tasks runs its search as full-text (PostgreSQL and searchable words)"""
+    return bool(params.search) and use_full_text_search(db) and search_tsquery(params.search) is not None
+
+
+def list_sort(params: TaskListParams, full_text: bool) -> Tuple[str, str]:
+    """Effective (sort_by, order) of a GET /tasks request"""
+    # relevance solo tiene sentido con búsqueda full-text
+    sort_by = params.sort_by
+    if sort_by is None:
+        sort_by = "relevance" if full_text else "created_at"
+    elif sort_by not in VALID_SORT_FIELDS and not (sort_by == "relevance" and full_text):
+        sort_by = "created_at"
+
+    order = "asc" if (params.order or "").lower() == "asc" else "desc"
+    return sort_by, order
+
+
+def list_cursor(params: TaskListParams, sort_by: str, order: str) -> Tuple[Any, int]:
+    """Decoded (sort_value, last_id) of the request's cursor"""
+    if params.limit is None:
+        raise BadRequestException(message="Debe proporcionar 'limit' junto con 'cursor'")
+    return decode_cursor(params.cursor, sort_by, order)
+
+
+def validate_task_list_params(db: Session, params: TaskListParams) -> None:
+    """
+    Raise BadRequestException for GET /tasks parameters that list_tasks_query
+    would reject (fields, cursor), without querying: the routes check them
+    before the ETag, so an invalid request is a 400 and never a 304.
+    """
+    response_fields(params.fields)
+    if params.cursor:
+        list_cursor(params, *list_sort(params, list_full_text(db, params)))
+
+
+def list_tasks_query(db: Session, user_id: int, params: TaskListParams) -> TaskListQuery:
+    """
+    Build (without running) the GET /tasks query. Only the columns of the
+    requested fieldset are selected; rows carry them plus id and sort_value.
+    """
+    fields = response_fields(params.fields)
+    full_text = list_full_text(db, params)
+    sort_by, order = list_sort(params, full_text)
+
+    if sort_by == "relevance":
+        # ts_rank_cd es float4: en double precision el valor del cursor (float de Python)
+        # es exactamente el de la fila, y los empates no se saltan ni se repiten entre páginas
+        sort_column = cast(func.ts_rank_cd(Task.search_vector, search_tsquery(params.search)), Float(53))
+        nullable = False
+    else:
+        sort_column = getattr(Task, sort_by)
+        nullable = Task.__table__.c[sort_by].nullable
+
+    descending = order == "desc"
+
+    # El valor de orden se selecciona junto a la tarea para construir el cursor
+    query = db.query(*task_columns(fields), sort_column.label("sort_value")).filter(
+        *params.criteria(user_id, full_text=full_text)
+    )
+
+    # Keyset pagination: (sort_column, id) como desempate estable
+    if params.cursor:
+        cursor_value, cursor_id = list_cursor(params, sort_by, order)
+        query = query.filter(keyset_after(sort_column, Task.id, descending, cursor_value, cursor_id, nullable))
+
+    query = query.order_by(*keyset_order_by(sort_column, Task.id, descending))
+
+    if params.limit is not None:
+        query = query.limit(params.limit + 1)
+
+    return TaskListQuery(query, sort_by, order, fields)
+
+
+def list_tasks(db: Session, user_id: int, params: TaskListParams) -> TaskPage:
+    built = list_tasks_query(db, user_id, params)
+
+    rows, has_more = page_rows(built.query.all(), params.limit)
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = encode_cursor(built.sort_by, built.order, last.sort_value, last.id)
+
+    return TaskPage(rows, next_cursor, built.fields)
+
+
+def task_list_cache_key(params: TaskListParams) -> Optional[str]:
+    """
+    Normalized GET /tasks parameters for task_list_cache, so equivalent
+    requests (default sort spelled out or not, fields in another order...)
+    share an entry. None for searches: free text rarely repeats.
+    """
+    if params.search:
+        return None
+
+    # Sin búsqueda: relevance o un campo inválido ordenan por created_at
+    sort_by, order = list_sort(params, full_text=False)
+
+    normalized = (
+        params.status.value if params.status else None,
+        params.category or None,
+        *(
+            value.isoformat() if value else None
+            for value in (
+                params.start_date_from, params.start_date_to,
+                params.deadline_from, params.deadline_to,
+                params.created_from, params.created_to
+            )
+        ),
+        sort_by,
+        order,
+        params.limit,
+        params.cursor,
+        response_fields(params.fields)
+    )
+    return hashlib.blake2b(repr(normalized).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def task_list_body(db: Session, user_id: int, params: TaskListParams) -> bytes:
+    """Serialized GET /tasks response envelope (what task_list_cache stores)"""
+    page = list_tasks(db, user_id, params)
+
+    tasks_response = [task_response_dict(task, page.fields) for task in page.tasks]
+
+    # next_cursor solo forma parte del sobre cuando se pidió paginación
+    extra = {"next_cursor": page.next_cursor} if params.limit is not None else {}
+
+    return dump_json(success_response(
+        message=f"Se encontraron {len(page.tasks)} tareas",
+        data=tasks_response,
+        **extra
+    ))
+
+
+def category_counts_query(db: Session, user_id: int) -> SQLQuery:
+    # Contadores mantenidos en cada escritura: lectura por clave primaria, sin GROUP BY
+    return db.query(
+        TaskCategoryCount.category,
+        TaskCategoryCount.count
+    ).filter(
+        TaskCategoryCount.user_id == user_id,
+        TaskCategoryCount.count > 0
+    ).order_by(desc(TaskCategoryCount.count), asc(TaskCategoryCount.category))
+
+
+def category_counts(db: Session, user_id: int) -> list:
+    return category_counts_query(db, user_id).all()
+
+
+def week_start(moment: datetime) -> datetime:
+    """Monday 00:00 UTC of the week containing `moment`"""
+    day = moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return day - timedelta(days=day.weekday())
+
+
+def task_stats_query(user_id: int, now: datetime, week_starts: List[datetime]):
+    """
+    Every dashboard figure in one pass over the user's tasks: one row per
+    (category, status) with its count plus FILTER aggregates for overdue,
+    due this week and completed in each of the given weeks
+    """
+    open_task = Task.status != TaskStatus.COMPLETADO.value
+    next_week = week_starts[-1] + timedelta(weeks=1)
+
+    completed_in_week = [
+        func.count().filter(
+            Task.completed_at >= start,
+            Task.completed_at < start + timedelta(weeks=1)
+        ).label(f"completed_{index}")
+        for index, start in enumerate(week_starts)
+    ]
+
+    return select(
+        Task.category,
+        Task.status,
+        func.count().label("total"),
+        func.count().filter(open_task, Task.deadline < now).label("overdue"),
+        func.count().filter(open_task, Task.deadline >= now, Task.deadline < next_week).label("due_this_week"),
+        *completed_in_week
+    ).where(
+        Task.user_id == user_id
+    ).group_by(Task.category, Task.status)
+
+
+def task_stats(db: Session, user_id: int, weeks: int = 8, now: Optional[datetime] = None) -> dict:
+    """
+    Dashboard statistics of a user's tasks: totals by status and by category
+    and status, overdue and due this week (not completed), and tasks
+    completed in each of the last `weeks` weeks (UTC, Monday to Sunday)
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    current_week = week_start(now)
+    week_starts = [current_week - timedelta(weeks=offset) for offset in range(weeks - 1, -1, -1)]
+
+    rows = db.execute(task_stats_query(user_id, now, week_starts)).all()
+
+    statuses = [status.value for status in TaskStatus]
+    by_status = dict.fromkeys(statuses, 0)
+    by_category = {}
+    completed_per_week = [0] * weeks
+    overdue = due_this_week = 0
+
+    for row in rows:
+        by_status[row.status] = by_status.get(row.status, 0) + row.total
+        category = counted_category(row.category)
+        if category not in by_category:
+            by_category[category] = {"category": category, "total": 0, **dict.fromkeys(statuses, 0)}
+        counts = by_category[category]
+        counts["total"] += row.total
+        counts[row.status] = counts.get(row.status, 0) + row.total
+        overdue += row.overdue
+        due_this_week += row.due_this_week
+        for index in range(weeks):
+            completed_per_week[index] += row._mapping[f"completed_{index}"]
+
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        # Mismo orden que /categories; las tareas sin categoría al final
+        "by_category": sorted(
+            by_category.values(),
+            key=lambda counts: (counts["category"] is None, -counts["total"], counts["category"] or "")
+        ),
+        "overdue": overdue,
+        "due_this_week": due_this_week,
+        "completed_per_week": [
+            {"week_start": start.date(), "completed": completed}
+            for start, completed in zip(week_starts, completed_per_week)
+        ],
+        "as_of": now
+    }
+
+
+def validate_calendar_month(year: int, month: int) -> None:
+    if month < 1 or month > 12:
+        raise BadRequestException(message="El mes debe estar entre 1 y 12")
+
+    if year < 2000 or year > 2100:
+        raise BadRequestException(message="El año debe estar entre 2000 y 2100")
+
+
+def calendar_tasks_query(db: Session, user_id: int, year: int, month: int, fields: Tuple[str, ...] = TASK_RESPONSE_FIELDS) -> SQLQuery:
+    validate_calendar_month(year, month)
+
+    # Obtener el primer y último día del mes
+    first_day = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+    # Calcular el último día del mes
+    if month == 12:
+        last_day = datetime(year + 1, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    else:
+        last_day = datetime(year, month + 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+
+    # Tareas que tengan start_date, deadline o created_at en este mes: un OR
+    # entre tres columnas no puede resolverse con rangos de índice, así que se
+    # unen tres búsquedas por rango, cada una sobre su índice (user_id, columna, id)
+    def in_month(column):
+        return select(Task.id).where(
+            Task.user_id == user_id,
+            column >= first_day,
+            column < last_day
+        )
+
+    task_ids = union(in_month(Task.start_date), in_month(Task.deadline), in_month(Task.created_at))
+
+    return db.query(*task_columns(fields)).filter(
+        Task.user_id == user_id,
+        Task.id.in_(task_ids)
+    ).order_by(asc(Task.start_date), asc(Task.id))
+
+
+def calendar_tasks(db: Session, user_id: int, year: int, month: int, fields: Tuple[str, ...] = TASK_RESPONSE_FIELDS) -> list:
+    return calendar_tasks_query(db, user_id, year, month, fields).all()
+
+
+def calendar_body(db: Session, user_id: int, year: int, month: int, version: Optional[int] = None, fields: Optional[str] = None) -> bytes:
+    """
+    Serialized GET /tasks/calendar response envelope (tasks restricted to
+    `fields`), served from calendar_cache while the user's data version is
+    unchanged. `version` must be read before the tasks (the routes get it
+    from the ETag check).
+    """
+    fields = response_fields(fields)
+    if version is None:
+        version = data_version(db, user_id)
+
+    key = f"{year}-{month}:{','.join(fields)}"
+    body = calendar_cache.get(user_id, version, key)
+    if body is not None:
+        return body
+
+    tasks = [task_response_dict(task, fields) for task in calendar_tasks(db, user_id, year, month, fields)]
+    body = dump_json(success_response(
+        message=f"Se encontraron {len(tasks)} tareas para {month}/{year}",
+        data={
+            "year": year,
+            "month": month,
+            "total_tasks": len(tasks),
+            "tasks": tasks
+        }
+    ))
+    calendar_cache.set(user_id, version, key, body)
+
+    return body
+
+
+def raise_task_missing(db: Session, task_id: int, forbidden_message: str) -> NoReturn:
+    """
+    Miss path of an ownership-scoped statement (WHERE id AND user_id): an
+    existence check tells a missing task (404) from another user's task (403)
+    """
+    if db.query(Task.id).filter(Task.id == task_id).first() is not None:
+        raise ForbiddenException(message=forbidden_message)
+
+    raise NotFoundException(message="Tarea no encontrada")
+
+
+def get_owned_task(db: Session, user_id: int, task_id: int, forbidden_message: str):
+    """Fetch one of the user's tasks (a row with the TaskResponse columns)"""
+    task = db.query(*task_columns(TASK_RESPONSE_FIELDS)).filter(
+        Task.id == task_id,
+        Task.user_id == user_id
+    ).first()
+
+    if task is None:
+        raise_task_missing(db, task_id, forbidden_message)
+
+    return task
+
+
+def update_task(db: Session, user_id: int, task_id: int, update_data: dict):
+    """Update one of the user's tasks with a single UPDATE ... WHERE id AND user_id RETURNING"""
+    forbidden_message = "No tienes permiso para editar esta tarea"
+
+    if not update_data:
+        # Se mantiene el orden de errores: 404/403 antes que 400
+        get_owned_task(db, user_id, task_id, forbidden_message)
+        raise BadRequestException(message="No se proporcionaron campos para actualizar")
+
+    rows = update_rows(db, user_id, [Task.user_id == user_id, Task.id == task_id], update_data)
+    if not rows:
+        raise_task_missing(db, task_id, forbidden_message)
+
+    db.commit()
+
+    return rows[0]
+
+
+def delete_task(db: Session, user_id: int, task_id: int) -> None:
+    """Delete one of the user's tasks with a single DELETE ... WHERE id AND user_id RETURNING"""
+    rows = delete_rows(db, user_id, [Task.user_id == user_id, Task.id == task_id])
+    if not rows:
+        raise_task_missing(db, task_id, "No tienes permiso para eliminar esta tarea")
+
+    db.commit()
+
+
+def task_id_in(db: Session, ids: List[int]):
+    """id IN (...) criterion; on PostgreSQL a single array parameter: id = ANY(:ids)"""
+    if db.get_bind().dialect.name == "postgresql":
+        return Task.id == any_(literal(list(ids), ARRAY(Integer)))
+    return Task.id.in_(ids)
+
+
+def bulk_criteria(db: Session, user_id: int, selection: TaskBulkSelection) -> list:
+    """WHERE criteria for the tasks of a bulk operation, always scoped to the user"""
+    if (selection.ids is None) == (selection.filter is None):
+        raise BadRequestException(message="Debe indicar 'ids' o 'filter' (solo uno de los dos)")
+
+    if selection.ids is not None:
+        return [Task.user_id == user_id, task_id_in(db, selection.ids)]
+
+    filters = TaskFilters(**selection.filter.model_dump())
+    return filters.criteria(user_id, full_text=use_full_text_search(db))
+
+
+def missing_task_ids(db: Session, requested: List[int], matched: Iterable[int]) -> Tuple[List[int], List[int]]:
+    """
+    Split the requested ids that a bulk statement did not touch into
+    (not_found, forbidden). Only runs a query when some id was missed.
+    """
+    missing = sorted(set(requested).difference(matched))
+    if not missing:
+        return [], []
+
+    existing = {row.id for row in db.query(Task.id).filter(task_id_in(db, missing))}
+    return [task_id for task_id in missing if task_id not in existing], [task_id for task_id in missing if task_id in existing]
+
+
+def completed_at_value(table, status: Optional[str]):
+    """
+    SET value of completed_at for a status change: kept if the task was
+    already completed (in the SET the columns still hold the old row), now()
+    if it becomes completed, NULL otherwise
+    """
+    if status != TaskStatus.COMPLETADO.value:
+        return None
+    return case(
+        (table.c.status == TaskStatus.COMPLETADO.value, table.c.completed_at),
+        else_=func.now()
+    )
+
+
+def update_rows(db: Session, user_id: int, criteria: list, update_data: dict) -> list:
+    """
+    UPDATE the user's tasks matching `criteria` with one statement and return
+    the updated rows (TaskResponse columns), sorted by id. Keeps the category
+    counters and the data version in sync; does not commit.
+    On PostgreSQL the targets are locked in a CTE that also returns their
+    previous category, so the counters stay exact in the same statement.
+    """
+    values = {
+        field: value.value if isinstance(value, TaskStatus) else value
+        for field, value in update_data.items()
+    }
+
+    table = Task.__table__
+    if "status" in values:
+        values["completed_at"] = completed_at_value(table, values["status"])
+    returning = [column for column in table.c if column.key in TaskResponse.model_fields]
+
+    if db.get_bind().dialect.name == "postgresql":
+        targets = select(table.c.id, table.c.category).where(*criteria).with_for_update().cte("targets")
+        statement = update(table).where(
+            table.c.id == targets.c.id,
+            table.c.user_id == user_id
+        ).values(values).returning(*returning, targets.c.category.label("old_category"))
+        rows = db.execute(statement).all()
+        old_categories = {row.id: row.old_category for row in rows}
+    else:
+        # Fuera de PostgreSQL el RETURNING no puede leer el CTE: categorías previas aparte
+        old_categories = dict(db.execute(select(table.c.id, table.c.category).where(*criteria)).all())
+        rows = db.execute(
+            update(table).where(table.c.id.in_(old_categories)).values(values).returning(*returning)
+        ).all() if old_categories else []
+
+    if rows:
+        deltas = Counter()
+        for row in rows:
+            deltas[counted_category(old_categories[row.id])] -= 1
+            deltas[counted_category(row.category)] += 1
+        adjust_category_counts(db, user_id, deltas)
+        bump_data_version(db, user_id)
+
+    return sorted(rows, key=attrgetter("id"))
+
+
+def delete_rows(db: Session, user_id: int, criteria: list) -> list:
+    """
+    DELETE the user's tasks matching `criteria` with one statement and return
+    the deleted (id, category) rows, sorted by id. Keeps the category counters
+    and the data version in sync; does not commit.
+    """
+    table = Task.__table__
+    rows = db.execute(
+        delete(table).where(*criteria).returning(table.c.id, table.c.category)
+    ).all()
+
+    if rows:
+        adjust_category_counts(db, user_id, category_deltas((row._mapping for row in rows), sign=-1))
+        bump_data_version(db, user_id)
+
+    return sorted(rows, key=attrgetter("id"))
+
+
+def bulk_update_tasks(db: Session, user_id: int, selection: TaskBulkSelection, update_data: dict) -> BulkResult:
+    """Apply the same changes to many tasks with a single UPDATE ... RETURNING"""
+    if not update_data:
+        raise BadRequestException(message="No se proporcionaron campos para actualizar")
+
+    rows = update_rows(db, user_id, bulk_criteria(db, user_id, selection), update_data)
+
+    not_found, forbidden = [], []
+    if selection.ids is not None:
+        not_found, forbidden = missing_task_ids(db, selection.ids, (row.id for row in rows))
+
+    db.commit()
+
+    return BulkResult(rows, not_found, forbidden)
+
+
+def bulk_delete_tasks(db: Session, user_id: int, selection: TaskBulkSelection) -> BulkResult:
+    """Delete many tasks with a single DELETE ... RETURNING"""
+    rows = delete_rows(db, user_id, bulk_criteria(db, user_id, selection))
+
+    not_found, forbidden = [], []
+    if selection.ids is not None:
+        not_found, forbidden = missing_task_ids(db, selection.ids, (row.id for row in rows))
+
+    db.commit()
+
+    return BulkResult(rows, not_found, forbidden)
@@ -1,14 +1,21 @@
-from fastapi import FastAPI, Request, HTTPException
+import logging
+
+from fastapi import Depends, FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.exceptions import RequestValidationError
 from fastapi.security import HTTPBearer
 from contextlib import asynccontextmanager
 
+from app.core.admission import AdmissionControlMiddleware, admission
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.core.exceptions import APIException
-from app.api import auth, tasks, debug
+from app.core.database import dispose_engines, Base
+from app.core.exceptions import APIException, NotModifiedException
+from app.core.internal import require_internal_token
+from app.core.metrics import MetricsMiddleware, metrics
+from app.core.query_stats import QueryStatsMiddleware, instrument_engines
+from app.core.security import shutdown_password_pool
+from app.api import auth, tasks, debug, auth_async, tasks_async
 
 
 @asynccontextmanager
@@ -16,7 +23,12 @@ async def lifespan(app: FastAPI):
     # Startup: Las tablas se crean con Alembic migrations
     # Base.metadata.create_all(bind=engine)  # Comentado - usar Alembic
     yield
-    # Shutdown: Add cleanup code here if needed
+    # Shutdown: cerrar el pool de bcrypt y los pools de conexiones
+    shutdown_password_pool()
+    await dispose_engines()
+
+
+logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s %(message)s")
 
 
 # Initialize FastAPI app
@@ -30,6 +42,11 @@ app = FastAPI(
     }
 )
 
+# Control de admisión por clase de ruta (se agrega antes que CORS para quedar
+# dentro de él: los 503 también llevan los headers CORS)
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # Configure CORS - Usar orígenes específicos desde settings
 cors_origins = settings.cors_origins
 print(f"🔒 CORS Origins configurados: {cors_origins}")
@@ -38,12 +55,34 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,  # Usar property que maneja la lógica
     allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["Authorization", "Content-Type", "Accept"],
 )
 
+# Sentencias SQL y tiempo de BD por request (Server-Timing, logs, N+1)
+if settings.SQL_INSTRUMENTATION_ENABLED:
+    instrument_engines()
+    app.add_middleware(QueryStatsMiddleware)
+
+# Métricas por ruta (latencia, status, en curso, tamaño) en formato Prometheus
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/metrics", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+    async def prometheus_metrics():
+        body = metrics.render()
+        if settings.ADMISSION_CONTROL_ENABLED:
+            body += admission.render()
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
 
 # Exception handler for custom API exceptions
+@app.exception_handler(NotModifiedException)
+async def not_modified_exception_handler(request: Request, exc: NotModifiedException):
+    # 304 nunca lleva cuerpo
+    return Response(status_code=exc.status_code, headers=exc.headers)
+
+
 @app.exception_handler(APIException)
 async def api_exception_handler(request: Request, exc: APIException):
     return JSONResponse(
@@ -52,7 +91,8 @@ async def api_exception_handler(request: Request, exc: APIException):
             "success": exc.success,
             "message": exc.message,
             "data": exc.data
-        }
+        },
+        headers=exc.headers
     )
 
 
@@ -149,15 +189,18 @@ async def health_check():
     }
 
 
-# Include routers
+# Include routers (versión async si ASYNC_DATABASE=true)
+auth_router = auth_async.router if settings.ASYNC_DATABASE else auth.router
+tasks_router = tasks_async.router if settings.ASYNC_DATABASE else tasks.router
+
 app.include_router(
-    auth.router,
+    auth_router,
     prefix=f"{settings.API_V1_STR}/auth",
     tags=["Authentication"]
 )
 
 app.include_router(
-    tasks.router,
+    tasks_router,
     prefix=f"{settings.API_V1_STR}/tasks",
     tags=["Tasks"]
 )
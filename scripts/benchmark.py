@@ -0,0 +1,475 @@
+"""
+Reproducible benchmark of the task API.
+
+1. Seed synthetic users and tasks (deterministic for a given --seed):
+    python -m scripts.benchmark seed --shape small --seed 1
+
+2. Drive the real app through login, list, search, calendar, categories,
+   update and bulk flows, either in-process (ASGI, no network) or against a
+   running server, and save p50/p95/p99, throughput and queries per request:
+    python -m scripts.benchmark run --shape small --seed 1 --output bench.json
+    python -m scripts.benchmark run --base-url http://localhost:8000 --output bench.json
+    python -m scripts.benchmark run --spawn-server --workers 4 --output bench.json
+
+3. Compare two runs (exit code 1 on a regression, for CI):
+    python -m scripts.benchmark compare baseline.json bench.json --max-regression 15
+
+Queries per request come from the Server-Timing header, so they need
+SQL_INSTRUMENTATION_ENABLED=true on the server. Requires httpx.
+"""
+import argparse
+import asyncio
+import json
+import math
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+try:
+    import httpx
+except ImportError:  # solo hace falta para `run`
+    httpx = None
+
+from sqlalchemy import delete, func, insert, select
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models.models import Task, User
+from app.services import tasks as task_service
+from scripts.synthetic_data import (
+    SHAPES, SYNTHETIC_PASSWORD, DataShape, generate_tasks, resolve_shape, task_count, user_email, user_email_pattern,
+    user_rng, user_row
+)
+
+INSERT_CHUNK_SIZE = 5000
+
+# Peso de cada flujo en la mezcla por defecto
+DEFAULT_MIX = {
+    "list": 30,
+    "search": 10,
+    "calendar": 15,
+    "categories": 15,
+    "update": 15,
+    "bulk": 5,
+    "login": 2,
+}
+
+
+def args_shape(args) -> DataShape:
+    return resolve_shape(args.shape, users=args.users, min_tasks=args.min_tasks, max_tasks=args.max_tasks)
+
+
+# ---------------------------------------------------------------------------
+# Seed
+# ---------------------------------------------------------------------------
+
+def seed(shape: DataShape, seed_value: int, reset: bool) -> None:
+    db = SessionLocal()
+    try:
+        pattern = user_email_pattern(seed_value)
+        existing = db.scalar(select(func.count(User.id)).where(User.email.like(pattern)))
+
+        if existing and not reset:
+            print(f"Ya hay {existing} usuarios sintéticos con seed {seed_value} (usar --reset para regenerarlos)")
+            return
+        if existing:
+            db.execute(delete(User).where(User.email.like(pattern)))
+            db.commit()
+
+        # bcrypt una sola vez: todos los usuarios comparten la contraseña
+        hashed_password = get_password_hash(SYNTHETIC_PASSWORD)
+        now = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        total_tasks = 0
+        pending: List[dict] = []
+
+        for index in range(shape.users):
+            user_id = db.execute(
+                insert(User).values(user_row(seed_value, index, hashed_password)).returning(User.id)
+            ).scalar_one()
+            rng = user_rng(seed_value, index)
+            for row in generate_tasks(rng, task_count(rng, shape), now, shape.history_days):
+                row["user_id"] = user_id
+                pending.append(row)
+                if len(pending) >= INSERT_CHUNK_SIZE:
+                    db.execute(insert(Task.__table__), pending)
+                    total_tasks += len(pending)
+                    pending = []
+
+        if pending:
+            db.execute(insert(Task.__table__), pending)
+            total_tasks += len(pending)
+
+        task_service.rebuild_category_counts(db)
+        db.commit()
+        print(f"✅ {shape.users} usuarios y {total_tasks} tareas en {time.perf_counter() - started:.1f}s")
+    finally:
+        db.close()
+
+
+# ---------------------------------------------------------------------------
+# Run
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Sample:
+    elapsed: float
+    ok: bool
+    queries: Optional[int]
+    db_ms: Optional[float]
+
+
+@dataclass
+class Recorder:
+    samples: Dict[str, List[Sample]] = field(default_factory=lambda: defaultdict(list))
+    enabled: bool = True
+
+    def record(self, name: str, elapsed: float, response) -> None:
+        if self.enabled:
+            queries, db_ms = parse_server_timing(response.headers.get("server-timing"))
+            self.samples[name].append(Sample(elapsed, response.status_code < 400, queries, db_ms))
+
+
+def parse_server_timing(header: Optional[str]):
+    """(statements, db ms) from the `db` metric of Server-Timing, or (None, None)"""
+    for metric in (header or "").split(","):
+        parts = [part.strip() for part in metric.split(";")]
+        if parts[0] != "db":
+            continue
+        values = dict(part.split("=", 1) for part in parts[1:] if "=" in part)
+        queries = values.get("desc", "").strip('"').split(" ")[0]
+        return (int(queries) if queries.isdigit() else None), float(values.get("dur", 0))
+    return None, None
+
+
+class VirtualUser:
+    """One synthetic user running the weighted flow mix with its own deterministic Random"""
+
+    def __init__(self, client, recorder: Recorder, email: str, rng: random.Random, mix: Dict[str, int]):
+        self.client = client
+        self.recorder = recorder
+        self.email = email
+        self.rng = rng
+        self.flows = list(mix)
+        self.weights = list(mix.values())
+        self.headers: Dict[str, str] = {}
+        self.task_ids: List[int] = []
+        self.now = datetime.now(timezone.utc)
+
+    async def request(self, name: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        self.recorder.record(name, time.perf_counter() - started, response)
+        return response
+
+    async def login(self) -> None:
+        response = await self.request(
+            "login", "POST", f"{settings.API_V1_STR}/auth/login",
+            json={"email": self.email, "password": SYNTHETIC_PASSWORD}
+        )
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['data']['access_token']}"}
+
+    async def setup(self) -> None:
+        await self.login()
+        response = await self.client.get(f"{settings.API_V1_STR}/tasks/?limit=200&fields=id", headers=self.headers)
+        response.raise_for_status()
+        self.task_ids = [task["id"] for task in response.json()["data"]]
+
+    async def run_until(self, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            flow = self.rng.choices(self.flows, self.weights)[0]
+            await getattr(self, f"flow_{flow}")()
+
+    async def flow_login(self) -> None:
+        await self.login()
+
+    async def flow_list(self) -> None:
+        sort_by = self.rng.choice(("created_at", "deadline", "start_date"))
+        response = await self.request("list", "GET", f"{settings.API_V1_STR}/tasks/?limit=50&sort_by={sort_by}")
+        cursor = response.json().get("next_cursor") if response.status_code == 200 else None
+        if cursor and self.rng.random() < 0.3:
+            await self.request(
+                "list_next_page", "GET", f"{settings.API_V1_STR}/tasks/?limit=50&sort_by={sort_by}&cursor={cursor}"
+            )
+
+    async def flow_search(self) -> None:
+        term = self.rng.choice(("informe", "cliente", "factura", "reunión", "presupuesto"))
+        await self.request("search", "GET", f"{settings.API_V1_STR}/tasks/?search={term}&limit=50")
+
+    async def flow_calendar(self) -> None:
+        months_back = self.rng.choice((0, 0, 0, 1, 2))
+        month_index = self.now.year * 12 + self.now.month - 1 - months_back
+        year, month = divmod(month_index, 12)
+        await self.request("calendar", "GET", f"{settings.API_V1_STR}/tasks/calendar/{year}/{month + 1}")
+
+    async def flow_categories(self) -> None:
+        await self.request("categories", "GET", f"{settings.API_V1_STR}/tasks/categories")
+
+    async def flow_update(self) -> None:
+        if not self.task_ids:
+            return
+        await self.request(
+            "update", "PUT", f"{settings.API_V1_STR}/tasks/{self.rng.choice(self.task_ids)}",
+            json={"status": self.rng.choice(("planificado", "en_progreso", "completado"))}
+        )
+
+    async def flow_bulk(self) -> None:
+        # Crea, actualiza y elimina un lote propio: el dataset no crece entre corridas
+        tasks = [{"title": f"Tarea de benchmark {n}", "category": "Benchmark"} for n in range(20)]
+        response = await self.request("bulk_create", "POST", f"{settings.API_V1_STR}/tasks/bulk", json={"tasks": tasks})
+        if response.status_code != 201:
+            return
+        ids = [task["id"] for task in response.json()["data"]]
+        await self.request(
+            "bulk_update", "PATCH", f"{settings.API_V1_STR}/tasks/bulk",
+            json={"ids": ids, "changes": {"status": "completado"}}
+        )
+        await self.request("bulk_delete", "DELETE", f"{settings.API_V1_STR}/tasks/bulk", json={"ids": ids})
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    return values[max(0, min(len(values) - 1, math.ceil(pct / 100 * len(values)) - 1))]
+
+
+def summarize(samples: List[Sample], wall_time: float) -> dict:
+    latencies = sorted(sample.elapsed * 1000 for sample in samples)
+    queries = [sample.queries for sample in samples if sample.queries is not None]
+    db_ms = [sample.db_ms for sample in samples if sample.db_ms is not None]
+    return {
+        "requests": len(samples),
+        "errors": sum(not sample.ok for sample in samples),
+        "throughput_rps": round(len(samples) / wall_time, 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "max_ms": round(latencies[-1], 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "db_ms_per_request": round(sum(db_ms) / len(db_ms), 3) if db_ms else None,
+    }
+
+
+def make_client(base_url: Optional[str], concurrency: int):
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if base_url:
+        return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+
+    import main  # in-process: la app real sobre ASGI, sin red
+
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark", timeout=60)
+
+
+async def run_benchmark(args, shape: DataShape, base_url: Optional[str]) -> dict:
+    mix = dict(DEFAULT_MIX)
+    if args.mix:
+        mix = {name: int(weight) for name, weight in (item.split("=") for item in args.mix.split(","))}
+        unknown = set(mix) - set(DEFAULT_MIX)
+        if unknown:
+            raise SystemExit(f"Flujos desconocidos en --mix: {', '.join(sorted(unknown))}")
+
+    recorder = Recorder()
+    rng = random.Random(args.seed)
+    # Los usuarios virtuales se reparten entre los usuarios sintéticos (chicos y pesados)
+    user_indexes = rng.sample(range(shape.users), min(args.concurrency, shape.users))
+
+    async with make_client(base_url, args.concurrency) as client:
+        vus = [
+            VirtualUser(
+                client, recorder, user_email(args.seed, user_indexes[n % len(user_indexes)]),
+                random.Random(f"{args.seed}:vu:{n}"), mix
+            )
+            for n in range(args.concurrency)
+        ]
+        # Login inicial y calentamiento fuera de la medición
+        recorder.enabled = False
+        await asyncio.gather(*(vu.setup() for vu in vus))
+        if args.warmup:
+            deadline = time.perf_counter() + args.warmup
+            await asyncio.gather(*(vu.run_until(deadline) for vu in vus))
+        recorder.enabled = True
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(vu.run_until(deadline) for vu in vus))
+        wall_time = time.perf_counter() - started
+
+    all_samples = [sample for samples in recorder.samples.values() for sample in samples]
+    if not all_samples:
+        raise SystemExit("No se registró ninguna petición")
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "mode": "http" if base_url else "in-process",
+            "base_url": base_url,
+            "async_database": settings.ASYNC_DATABASE if not base_url else None,
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "shape": shape.as_dict(),
+            "concurrency": args.concurrency,
+            "duration_seconds": round(wall_time, 3),
+            "warmup_seconds": args.warmup,
+            "mix": mix,
+        },
+        "total": summarize(all_samples, wall_time),
+        "scenarios": {
+            name: summarize(samples, wall_time)
+            for name, samples in sorted(recorder.samples.items())
+        },
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def spawn_server(port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ])
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        if server.poll() is not None:
+            raise SystemExit("El servidor terminó al iniciar")
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("El servidor no respondió en /health a tiempo")
+
+
+def print_summary(result: dict) -> None:
+    header = f"{'flujo':<16}{'reqs':>8}{'err':>6}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'queries':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = list(result["scenarios"].items()) + [("TOTAL", result["total"])]
+    for name, stats in rows:
+        queries = stats["queries_per_request"]
+        print(
+            f"{name:<16}{stats['requests']:>8}{stats['errors']:>6}{stats['throughput_rps']:>9.1f}"
+            f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+            f"{queries if queries is not None else '-':>9}"
+        )
+
+
+def run(args) -> None:
+    if httpx is None:
+        raise SystemExit("El benchmark requiere httpx: pip install httpx")
+
+    shape = args_shape(args)
+    base_url = args.base_url
+    server = None
+    if args.spawn_server:
+        server = spawn_server(args.port, args.workers)
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        result = asyncio.run(run_benchmark(args, shape, base_url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_summary(result)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.output}")
+
+
+# ---------------------------------------------------------------------------
+# Compare
+# ---------------------------------------------------------------------------
+
+def compare(args) -> None:
+    with open(args.baseline) as baseline_file, open(args.current) as current_file:
+        baseline, current = json.load(baseline_file), json.load(current_file)
+
+    regressions = []
+    print(f"{'flujo':<16}{'p95 base':>10}{'p95 actual':>12}{'cambio':>9}{'queries':>12}")
+    for name, stats in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        change = (stats["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100 if base["p95_ms"] else 0.0
+        queries = f"{base['queries_per_request']}→{stats['queries_per_request']}"
+        print(f"{name:<16}{base['p95_ms']:>10.1f}{stats['p95_ms']:>12.1f}{change:>8.1f}%{queries:>12}")
+
+        if change > args.max_regression:
+            regressions.append(f"{name}: p95 {change:+.1f}%")
+        if (base["queries_per_request"] is not None and stats["queries_per_request"] is not None
+                and stats["queries_per_request"] - base["queries_per_request"] > args.max_query_increase):
+            regressions.append(f"{name}: queries por request {queries}")
+
+    if regressions:
+        print("\n❌ Regresiones:\n  " + "\n  ".join(regressions))
+        sys.exit(1)
+    print("\n✅ Sin regresiones")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark reproducible de la API de tareas")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_shape_arguments(command):
+        command.add_argument("--shape", choices=sorted(SHAPES), default="small", help="Forma del dataset (default: small)")
+        command.add_argument("--users", type=int, help="Sobrescribe los usuarios de la forma")
+        command.add_argument("--min-tasks", type=int, help="Sobrescribe el mínimo de tareas por usuario")
+        command.add_argument("--max-tasks", type=int, help="Sobrescribe el máximo de tareas por usuario")
+        command.add_argument("--seed", type=int, default=1, help="Semilla del dataset y de los flujos (default: 1)")
+
+    seed_command = commands.add_parser("seed", help="Sembrar usuarios y tareas sintéticos")
+    add_shape_arguments(seed_command)
+    seed_command.add_argument("--reset", action="store_true", help="Borrar y regenerar los usuarios de esta seed")
+
+    run_command = commands.add_parser("run", help="Ejecutar el benchmark")
+    add_shape_arguments(run_command)
+    run_command.add_argument("--concurrency", type=int, default=10, help="Usuarios virtuales concurrentes (default: 10)")
+    run_command.add_argument("--duration", type=float, default=30, help="Segundos de medición (default: 30)")
+    run_command.add_argument("--warmup", type=float, default=5, help="Segundos de calentamiento sin medir (default: 5)")
+    run_command.add_argument("--mix", help="Pesos de los flujos, ej: list=50,calendar=20,update=30")
+    run_command.add_argument("--base-url", help="Servidor ya levantado (por defecto: la app en proceso)")
+    run_command.add_argument("--spawn-server", action="store_true", help="Levantar uvicorn en un subproceso")
+    run_command.add_argument("--port", type=int, default=8765, help="Puerto de --spawn-server (default: 8765)")
+    run_command.add_argument("--workers", type=int, default=1, help="Workers de --spawn-server (default: 1)")
+    run_command.add_argument("--output", help="Archivo JSON de resultados")
+
+    compare_command = commands.add_parser("compare", help="Comparar dos resultados JSON")
+    compare_command.add_argument("baseline")
+    compare_command.add_argument("current")
+    compare_command.add_argument("--max-regression", type=float, default=10, help="%% de aumento de p95 tolerado (default: 10)")
+    compare_command.add_argument(
+        "--max-query-increase", type=float, default=0.1,
+        help="Aumento tolerado de queries por request, absoluto (default: 0.1; el cache de usuarios introduce ruido)"
+    )
+
+    args = parser.parse_args()
+    if args.command == "seed":
+        seed(args_shape(args), args.seed, args.reset)
+    elif args.command == "run":
+        run(args)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Regression check for the query plans of the task endpoints.
+
+Seeds a realistic amount of data inside a transaction, runs EXPLAIN on the
+exact queries built by app/services/tasks.py and fails if any of them falls
+back to a sequential scan on `tasks` (or does not use one of the expected
+indexes). Everything is rolled back at the end.
+
+Usage (PostgreSQL with all migrations applied; ideally a scratch database):
+    python -m scripts.check_query_plans
+    python -m scripts.check_query_plans --users 500 --tasks-per-user 1000 -v
+
+Exit code 1 if any check fails, so it can run in CI.
+"""
+import argparse
+import json
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.core.pagination import encode_cursor
+from app.schemas.schemas import TaskStatus
+from app.services import tasks as task_service
+from app.services.tasks import TaskListParams
+
+TASK_LIST_DEFAULTS = dict(
+    status=None, category=None, start_date_from=None, start_date_to=None,
+    deadline_from=None, deadline_to=None, created_from=None, created_to=None,
+    search=None, sort_by=None, order="desc", limit=50, cursor=None, fields=None,
+)
+
+
+def list_params(**overrides) -> TaskListParams:
+    return TaskListParams(**{**TASK_LIST_DEFAULTS, **overrides})
+
+
+@dataclass
+class PlanCheck:
+    name: str
+    build: Callable[[Session, int], object]
+    # Al menos uno de estos índices debe aparecer en el plan (None = no verificar)
+    expected_indexes: Optional[Set[str]] = None
+
+
+def plan_checks() -> List[PlanCheck]:
+    now = datetime.now(timezone.utc)
+    return [
+        PlanCheck(
+            "list: default sort (created_at desc)",
+            lambda db, uid: task_service.list_tasks_query(db, uid, list_params()).query,
+            {"ix_tasks_user_id_created_at"},
+        ),
+        PlanCheck(
+            "list: created_at asc, page 2 (keyset cursor)",
+            lambda db, uid: task_service.list_tasks_query(db, uid, list_params(
+                order="asc",
+                cursor=encode_cursor("created_at", "asc", now - timedelta(days=200), 1),
+            )).query,
+            {"ix_tasks_user_id_created_at"},
+        ),
+        PlanCheck(
+            "list: sort by deadline asc",
+            lambda db, uid: task_service.list_tasks_query(db, uid, list_params(sort_by="deadline", order="asc")).query,
+            {"ix_tasks_user_id_deadline"},
+        ),
+        PlanCheck(
+            "list: sort by start_date desc",
+            lambda db, uid: task_service.list_tasks_query(db, uid, list_params(sort_by="start_date")).query,
+            {"ix_tasks_user_id_start_date"},
+        ),
+        PlanCheck(
+            "list: status filter",
+            lambda db, uid: task_service.list_tasks_query(db, uid, list_params(status=TaskStatus.EN_PROGRESO)).query,
+            {"ix_tasks_user_id_status", "ix_tasks_user_id_created_at"},
+        ),
+        PlanCheck(
+            "list: category filter",
+            lambda db, uid: task_service.list_tasks_query(db, uid, list_params(category="Trabajo")).query,
+            {"ix_tasks_user_id_category", "ix_tasks_user_id_created_at"},
+        ),
+        PlanCheck(
+            "list: deadline range",
+            lambda db, uid: task_service.list_tasks_query(db, uid, list_params(
+                deadline_from=now, deadline_to=now + timedelta(days=7), sort_by="deadline", order="asc",
+            )).query,
+            {"ix_tasks_user_id_deadline"},
+        ),
+        PlanCheck(
+            "list: full-text search",
+            lambda db, uid: task_service.list_tasks_query(db, uid, list_params(search="informe")).query,
+            None,
+        ),
+        PlanCheck(
+            "categories",
+            lambda db, uid: task_service.category_counts_query(db, uid),
+            {"task_category_counts_pkey"},
+        ),
+        PlanCheck(
+            "calendar: current month",
+            lambda db, uid: task_service.calendar_tasks_query(db, uid, now.year, now.month),
+            {"ix_tasks_user_id_start_date", "ix_tasks_user_id_deadline", "ix_tasks_user_id_created_at"},
+        ),
+        PlanCheck(
+            "stats: one grouped pass over the user's tasks",
+            lambda db, uid: task_service.task_stats_query(
+                uid, now, [task_service.week_start(now) - timedelta(weeks=week) for week in range(7, -1, -1)]
+            ),
+            {
+                "ix_tasks_user_id_category", "ix_tasks_user_id_status", "ix_tasks_user_id_created_at",
+                "ix_tasks_user_id_deadline", "ix_tasks_user_id_start_date",
+            },
+        ),
+    ]
+
+
+SEED_USERS_SQL = """
+INSERT INTO users (name, email, hashed_password)
+SELECT 'Plan check ' || g, 'plan-check-' || g || '@example.invalid', 'x'
+FROM generate_series(1, :users) AS g
+RETURNING id
+"""
+
+# Estados, categorías y fechas variados (incluye NULLs en start_date/deadline)
+SEED_TASKS_SQL = """
+INSERT INTO tasks (title, description, category, status, start_date, deadline, created_at, completed_at, user_id)
+SELECT
+    (ARRAY['Informe', 'Reunión', 'Revisar', 'Llamar', 'Preparar'])[1 + (g % 5)] || ' tarea ' || g,
+    CASE WHEN g % 3 = 0 THEN 'Descripción de la tarea ' || g ELSE NULL END,
+    (ARRAY['Trabajo', 'Personal', 'Urgente', 'Proyecto X', NULL])[1 + (g % 5)],
+    (ARRAY['planificado', 'en_progreso', 'completado', 'completado'])[1 + (g % 4)],
+    CASE WHEN g % 4 = 0 THEN NULL ELSE now() - (g % 365) * interval '1 day' END,
+    CASE WHEN g % 2 = 0 THEN NULL ELSE now() + ((g % 90) - 30) * interval '1 day' END,
+    now() - (g % 720) * interval '1 day',
+    CASE WHEN g % 4 >= 2 THEN now() - (g % 60) * interval '1 day' ELSE NULL END,
+    u.id
+FROM unnest(CAST(:user_ids AS integer[])) AS u(id)
+CROSS JOIN generate_series(1, :tasks_per_user) AS g
+"""
+
+
+def plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(db: Session, query) -> dict:
+    statement = getattr(query, "statement", query)
+    compiled = statement.compile(dialect=db.get_bind().dialect)
+    result = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + str(compiled), compiled.params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def run(users: int, tasks_per_user: int, verbose: bool) -> int:
+    if engine.dialect.name != "postgresql":
+        print("❌ Este chequeo requiere PostgreSQL (DATABASE_URL)")
+        return 1
+
+    failures = 0
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            db = Session(bind=connection, join_transaction_mode="create_savepoint")
+
+            print(f"Sembrando {users} usuarios x {tasks_per_user} tareas (se revierte al final)...")
+            user_ids = [row.id for row in db.execute(text(SEED_USERS_SQL), {"users": users})]
+            db.execute(text(SEED_TASKS_SQL), {"user_ids": user_ids, "tasks_per_user": tasks_per_user})
+            task_service.rebuild_category_counts(db)
+            db.execute(text("ANALYZE users"))
+            db.execute(text("ANALYZE tasks"))
+            db.execute(text("ANALYZE task_category_counts"))
+            user_id = user_ids[0]
+
+            for check in plan_checks():
+                plan = explain(db, check.build(db, user_id))
+                nodes = list(plan_nodes(plan))
+                seq_scans = [n for n in nodes if n["Node Type"] == "Seq Scan" and n.get("Relation Name") == "tasks"]
+                used_indexes = {n["Index Name"] for n in nodes if "Index Name" in n}
+
+                problems = []
+                if seq_scans:
+                    problems.append("Seq Scan sobre tasks")
+                if check.expected_indexes and not (used_indexes & check.expected_indexes):
+                    problems.append(f"se esperaba alguno de {sorted(check.expected_indexes)}")
+
+                status = "❌" if problems else "✅"
+                detail = ", ".join(sorted(used_indexes)) or "sin índices"
+                print(f"{status} {check.name}: {detail}" + (f" ({'; '.join(problems)})" if problems else ""))
+                if verbose or problems:
+                    print(json.dumps(plan, indent=2, ensure_ascii=False))
+                failures += bool(problems)
+        finally:
+            transaction.rollback()
+
+    print(f"\n{failures} chequeo(s) fallidos" if failures else "\nTodos los planes usan índices")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Verificar con EXPLAIN que las consultas de tareas usan índices")
+    parser.add_argument("--users", type=int, default=200, help="Usuarios a sembrar (default: 200)")
+    parser.add_argument("--tasks-per-user", type=int, default=500, help="Tareas por usuario (default: 500)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Mostrar todos los planes")
+    args = parser.parse_args()
+    sys.exit(run(args.users, args.tasks_per_user, args.verbose))
+
+
+if __name__ == "__main__":
+    main()
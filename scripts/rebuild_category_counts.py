@@ -0,0 +1,70 @@
+"""
+Rebuild the task_category_counts summary table from the tasks table.
+
+The counters are maintained incrementally by the task write paths; run this
+if they drift (manual SQL edits, restored backups, a bug):
+    python -m scripts.rebuild_category_counts
+    python -m scripts.rebuild_category_counts --user-id 42
+    python -m scripts.rebuild_category_counts --check
+
+With --check nothing is written: the differences are listed and the exit
+code is 1 if any counter is out of sync.
+"""
+import argparse
+import sys
+from typing import Optional
+
+from sqlalchemy import func, select
+
+from app.core.database import SessionLocal
+from app.models.models import Task, TaskCategoryCount
+from app.services import tasks as task_service
+
+
+def count_drift(db, user_id: Optional[int] = None) -> list:
+    """Return (user_id, category, stored, actual) for every counter out of sync"""
+    actual_query = select(Task.user_id, Task.category, func.count(Task.id)).where(
+        Task.category.isnot(None),
+        Task.category != ''
+    ).group_by(Task.user_id, Task.category)
+    stored_query = select(TaskCategoryCount.user_id, TaskCategoryCount.category, TaskCategoryCount.count)
+
+    if user_id is not None:
+        actual_query = actual_query.where(Task.user_id == user_id)
+        stored_query = stored_query.where(TaskCategoryCount.user_id == user_id)
+
+    actual = {(row[0], row[1]): row[2] for row in db.execute(actual_query)}
+    stored = {(row[0], row[1]): row[2] for row in db.execute(stored_query)}
+
+    return sorted(
+        (key[0], key[1], stored.get(key, 0), actual.get(key, 0))
+        for key in actual.keys() | stored.keys()
+        if stored.get(key, 0) != actual.get(key, 0)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recalcular los contadores de tareas por categoría")
+    parser.add_argument("--user-id", type=int, default=None, help="Recalcular solo este usuario (default: todos)")
+    parser.add_argument("--check", action="store_true", help="Solo reportar diferencias, sin escribir")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = count_drift(db, args.user_id)
+        for user_id, category, stored, actual in drift:
+            print(f"usuario {user_id} / {category!r}: guardado {stored}, real {actual}")
+
+        if args.check:
+            print(f"{len(drift)} contador(es) desincronizados" if drift else "Contadores sincronizados")
+            sys.exit(1 if drift else 0)
+
+        rows = task_service.rebuild_category_counts(db, args.user_id)
+        db.commit()
+        print(f"✅ Contadores recalculados ({rows} filas, {len(drift)} corregidas)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
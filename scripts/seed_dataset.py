@@ -0,0 +1,239 @@
+"""
+High-volume synthetic dataset seeder (PostgreSQL, COPY FROM STDIN).
+
+Generates the same deterministic users and tasks as the benchmark suite
+(scripts/synthetic_data.py) and streams them into `users` / `tasks` with
+COPY from parallel worker processes. Meant for capacity tests and for
+rehearsing migrations and index changes on a realistic volume:
+
+    python -m scripts.seed_dataset --shape large --seed 1 --workers 8
+    python -m scripts.seed_dataset --users 500000 --min-tasks 1 --max-tasks 1000 --workers 16 --defer-indexes
+
+All synthetic users log in with the same password (SYNTHETIC_PASSWORD); a
+few bcrypt hashes of it are computed once and reused, so seeding does not
+spend hours in bcrypt. With --now fixed as well, the same --seed always
+produces the same users and tasks (only the ids depend on worker timing).
+
+Run it against a scratch database: user ids are reserved from the users
+sequence up front, --defer-indexes drops the task indexes while loading
+(their CREATE INDEX statements are printed and saved to --index-backup
+first, and they are recreated even if the load fails or is interrupted),
+and --truncate empties the users and tasks tables.
+"""
+import argparse
+import io
+import multiprocessing
+import time
+from datetime import datetime, timezone
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import create_engine, delete, func, select, text
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.models import Task, User
+from app.services import tasks as task_service
+from app.services.task_import import copy_text_value
+from scripts.synthetic_data import (
+    SHAPES, SYNTHETIC_PASSWORD, DataShape, generate_tasks, resolve_shape, task_count, user_email_pattern, user_rng, user_row
+)
+
+USER_COLUMNS = ["id", "name", "email", "hashed_password"]
+TASK_COLUMNS = [
+    "title", "description", "category", "status", "start_date", "deadline", "created_at", "completed_at", "user_id"
+]
+
+# Usuarios por unidad de trabajo: lotes chicos reparten mejor la carga,
+# ya que unos pocos usuarios concentran la mayoría de las tareas
+USERS_PER_BATCH = 50
+
+
+def copy_rows(cursor, table: str, columns: Sequence[str], rows) -> int:
+    """COPY already-built row dicts into `table` (text format) and return the row count"""
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write("\t".join(copy_text_value(row[column]) for column in columns))
+        buffer.write("\n")
+        count += 1
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN", buffer)
+    return count
+
+
+def load_tasks(batch: Tuple[int, DataShape, List[Tuple[int, int]], str, int, str]) -> int:
+    """
+    Worker: generate and COPY the tasks of a batch of (user index, user id)
+    pairs in chunks of `chunk_size` rows, in a single transaction
+    """
+    seed, shape, users, now_iso, chunk_size, database_url = batch
+    now = datetime.fromisoformat(now_iso)
+
+    engine = create_engine(database_url, poolclass=NullPool)
+    connection = engine.raw_connection()
+    loaded = 0
+    try:
+        with connection.cursor() as cursor:
+            # Solo para la carga: si el servidor cae se vuelve a sembrar
+            cursor.execute("SET synchronous_commit TO off")
+            pending = []
+            for index, user_id in users:
+                rng = user_rng(seed, index)
+                for row in generate_tasks(rng, task_count(rng, shape), now, shape.history_days):
+                    row["user_id"] = user_id
+                    pending.append(row)
+                    if len(pending) >= chunk_size:
+                        loaded += copy_rows(cursor, Task.__tablename__, TASK_COLUMNS, pending)
+                        pending = []
+            if pending:
+                loaded += copy_rows(cursor, Task.__tablename__, TASK_COLUMNS, pending)
+        connection.commit()
+    finally:
+        connection.close()
+        engine.dispose()
+    return loaded
+
+
+def task_index_definitions(db: Session) -> List[Tuple[str, str]]:
+    """(name, CREATE INDEX statement) of the secondary indexes of `tasks` (not the primary key)"""
+    rows = db.execute(text("""
+        SELECT i.indexname, i.indexdef
+        FROM pg_indexes AS i
+        WHERE i.schemaname = current_schema()
+          AND i.tablename = :table
+          AND NOT EXISTS (
+              SELECT 1 FROM pg_constraint AS c
+              WHERE c.conname = i.indexname AND c.contype IN ('p', 'u')
+          )
+        ORDER BY i.indexname
+    """), {"table": Task.__tablename__})
+    return [(row.indexname, row.indexdef) for row in rows]
+
+
+def drop_task_indexes(db: Session, backup_path: str) -> List[Tuple[str, str]]:
+    """
+    Drop the secondary indexes of `tasks` and return their definitions. The
+    CREATE INDEX statements are printed and written to `backup_path` first,
+    so they can be recreated by hand if this process dies before doing it.
+    """
+    definitions = task_index_definitions(db)
+    with open(backup_path, "w", encoding="utf-8") as backup:
+        backup.writelines(f"{definition};\n" for _, definition in definitions)
+    print(f"Índices de tasks a eliminar (copia en {backup_path}):")
+    for _, definition in definitions:
+        print(f"  {definition};")
+
+    for name, _ in definitions:
+        db.execute(text(f'DROP INDEX "{name}"'))
+    db.commit()
+    return definitions
+
+
+def recreate_indexes(db: Session, definitions: List[Tuple[str, str]]) -> None:
+    # La sesión puede haber quedado en una transacción abortada por el error
+    db.rollback()
+    for name, definition in definitions:
+        print(f"Recreando {name}...")
+        db.execute(text(definition))
+        db.commit()
+
+
+def reserve_user_ids(db: Session, count: int) -> List[int]:
+    """Take `count` ids from the users sequence, so workers know them before the users exist"""
+    return list(db.scalars(
+        text("SELECT nextval(pg_get_serial_sequence('users', 'id')) FROM generate_series(1, :count)"),
+        {"count": count}
+    ))
+
+
+def seed(args, shape: DataShape) -> None:
+    engine = create_engine(settings.DATABASE_URL, poolclass=NullPool)
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("❌ El seeder usa COPY y requiere PostgreSQL (para otras bases: python -m scripts.benchmark seed)")
+
+    now = datetime.fromisoformat(args.now) if args.now else datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+
+    started = time.perf_counter()
+    with Session(engine) as db:
+        pattern = user_email_pattern(args.seed)
+        if args.truncate:
+            db.execute(text("TRUNCATE tasks, task_category_counts, user_data_versions, users"))
+            db.commit()
+        existing = db.scalar(select(func.count(User.id)).where(User.email.like(pattern)))
+        if existing and not args.reset:
+            raise SystemExit(f"Ya hay {existing} usuarios sintéticos con seed {args.seed} (usar --reset o --truncate)")
+        if existing:
+            print(f"Eliminando {existing} usuarios de la seed {args.seed} y sus tareas...")
+            db.execute(delete(User).where(User.email.like(pattern)))
+            db.commit()
+
+        # bcrypt solo --password-hashes veces (misma contraseña, distinta sal)
+        hashes = [get_password_hash(SYNTHETIC_PASSWORD) for _ in range(args.password_hashes)]
+
+        user_ids = reserve_user_ids(db, shape.users)
+        with db.connection().connection.driver_connection.cursor() as cursor:
+            copy_rows(cursor, User.__tablename__, USER_COLUMNS, (
+                {"id": user_id, **user_row(args.seed, index, hashes[index % len(hashes)])}
+                for index, user_id in enumerate(user_ids)
+            ))
+
+        db.commit()
+        dropped = drop_task_indexes(db, args.index_backup) if args.defer_indexes else []
+        print(f"{shape.users} usuarios cargados; generando tareas con {args.workers} workers...")
+
+        pairs = list(enumerate(user_ids))
+        batches = [
+            (args.seed, shape, pairs[start:start + USERS_PER_BATCH], now.isoformat(), args.chunk_size, settings.DATABASE_URL)
+            for start in range(0, len(pairs), USERS_PER_BATCH)
+        ]
+        loaded = 0
+        report_every = max(1, len(batches) // 20)
+        try:
+            # spawn: cada worker abre su propia conexión (nada heredado del proceso principal)
+            with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+                for done, count in enumerate(pool.imap_unordered(load_tasks, batches), start=1):
+                    loaded += count
+                    if done % report_every == 0 or done == len(batches):
+                        elapsed = time.perf_counter() - started
+                        print(f"  {done}/{len(batches)} lotes, {loaded:,} tareas ({loaded / elapsed:,.0f} filas/s)")
+        finally:
+            # También si un worker falla o se interrumpe con Ctrl-C: nunca dejar tasks sin índices
+            recreate_indexes(db, dropped)
+
+        print("Recalculando contadores por categoría y estadísticas...")
+        task_service.rebuild_category_counts(db)
+        db.commit()
+        for table in (User.__tablename__, Task.__tablename__, "task_category_counts"):
+            db.execute(text(f"ANALYZE {table}"))
+        db.commit()
+
+    engine.dispose()
+    print(f"✅ {shape.users:,} usuarios y {loaded:,} tareas en {time.perf_counter() - started:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sembrar un dataset sintético grande con COPY y workers en paralelo")
+    parser.add_argument("--shape", choices=sorted(SHAPES), default="large", help="Forma del dataset (default: large)")
+    parser.add_argument("--users", type=int, help="Sobrescribe los usuarios de la forma")
+    parser.add_argument("--min-tasks", type=int, help="Sobrescribe el mínimo de tareas por usuario")
+    parser.add_argument("--max-tasks", type=int, help="Sobrescribe el máximo de tareas por usuario")
+    parser.add_argument("--seed", type=int, default=1, help="Semilla de los datos (default: 1)")
+    parser.add_argument("--now", help="Fecha de referencia ISO para las fechas (default: ahora); fijarla hace la carga reproducible")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count(), help="Procesos en paralelo (default: CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Filas por COPY (default: 50000)")
+    parser.add_argument("--password-hashes", type=int, default=8, help="Hashes bcrypt distintos a precalcular (default: 8)")
+    parser.add_argument("--defer-indexes", action="store_true", help="Eliminar los índices de tasks durante la carga y recrearlos al final")
+    parser.add_argument("--index-backup", default="seed_dataset_indexes.sql", help="Archivo donde guardar los CREATE INDEX antes de eliminarlos (default: seed_dataset_indexes.sql)")
+    parser.add_argument("--reset", action="store_true", help="Eliminar antes los usuarios de esta seed")
+    parser.add_argument("--truncate", action="store_true", help="Vaciar users y tasks antes de cargar (¡destructivo!)")
+    args = parser.parse_args()
+
+    seed(args, resolve_shape(args.shape, users=args.users, min_tasks=args.min_tasks, max_tasks=args.max_tasks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Deterministic synthetic users and tasks with realistic skew, shared by the
+benchmark suite (scripts/benchmark.py) and the dataset seeder.
+
+Every user has its own Random seeded with (seed, user index), so the same
+seed always yields the same data regardless of how the users are split
+between workers or chunks.
+"""
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Iterator, Optional
+
+# Contraseña de todos los usuarios sintéticos (para el login de los benchmarks)
+SYNTHETIC_PASSWORD = "benchmark-password"
+
+
+@dataclass(frozen=True)
+class DataShape:
+    users: int
+    min_tasks: int
+    max_tasks: int
+    # Exponente de la distribución de tareas por usuario: cuanto mayor, más
+    # usuarios cerca de min_tasks y menos usuarios "pesados" cerca de max_tasks
+    task_skew: float = 4.0
+    # Antigüedad máxima de las tareas (las recientes son más frecuentes)
+    history_days: int = 730
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+SHAPES = {
+    "tiny": DataShape(users=5, min_tasks=10, max_tasks=500),
+    "small": DataShape(users=50, min_tasks=10, max_tasks=5_000),
+    "medium": DataShape(users=1_000, min_tasks=1, max_tasks=10_000),
+    "large": DataShape(users=10_000, min_tasks=1, max_tasks=100_000),
+}
+
+
+def resolve_shape(name: str, **overrides) -> DataShape:
+    """A preset shape with the given fields replaced (None values are ignored)"""
+    values = {**SHAPES[name].as_dict(), **{key: value for key, value in overrides.items() if value is not None}}
+    return DataShape(**values)
+
+
+# (categoría, peso); None = sin categoría
+CATEGORIES = (
+    ("Trabajo", 34), ("Personal", 22), (None, 12), ("Urgente", 8), ("Proyecto X", 7),
+    ("Estudio", 6), ("Casa", 5), ("Salud", 4), ("Finanzas", 2),
+)
+CATEGORY_NAMES = [name for name, _ in CATEGORIES]
+CATEGORY_WEIGHTS = [weight for _, weight in CATEGORIES]
+
+VERBS = ("Revisar", "Preparar", "Enviar", "Llamar a", "Actualizar", "Terminar", "Planificar", "Comprar", "Leer", "Organizar")
+OBJECTS = (
+    "informe trimestral", "presupuesto", "reunión de equipo", "cliente", "documentación",
+    "factura", "presentación", "contrato", "curso de inglés", "médico", "proveedor", "backlog",
+)
+DETAILS = (
+    "Pendiente de aprobación.", "Coordinar con el equipo.", "Revisar antes del viernes.",
+    "Incluir métricas del último mes.", "Ver correo anterior.", "Prioridad media.",
+)
+
+
+def user_rng(seed: int, index: int) -> random.Random:
+    return random.Random(f"{seed}:{index}")
+
+
+def user_email_pattern(seed: int) -> str:
+    """SQL LIKE pattern matching every synthetic user of a seed"""
+    return f"synthetic-{seed}-%@example.com"
+
+
+def user_email(seed: int, index: int) -> str:
+    # example.com: la validación de EmailStr rechaza dominios reservados como .invalid
+    return f"synthetic-{seed}-{index}@example.com"
+
+
+def user_row(seed: int, index: int, hashed_password: str) -> dict:
+    return {"name": f"Usuario sintético {index}", "email": user_email(seed, index), "hashed_password": hashed_password}
+
+
+def task_count(rng: random.Random, shape: DataShape) -> int:
+    """Tasks of one user: heavily skewed towards min_tasks, with a long tail up to max_tasks"""
+    return shape.min_tasks + int((shape.max_tasks - shape.min_tasks) * rng.random() ** shape.task_skew)
+
+
+def task_status(rng: random.Random, age_days: int) -> str:
+    # Las tareas viejas casi siempre están completadas; las recientes, no
+    if age_days > 60:
+        return rng.choices(("completado", "en_progreso", "planificado"), (85, 5, 10))[0]
+    return rng.choices(("completado", "en_progreso", "planificado"), (25, 30, 45))[0]
+
+
+def generate_tasks(rng: random.Random, count: int, now: datetime, history_days: int = 730) -> Iterator[dict]:
+    """Task rows (without user_id) for one user, oldest first"""
+    ages = sorted((rng.random() ** 2.5 * history_days for _ in range(count)), reverse=True)
+
+    for number, age in enumerate(ages, start=1):
+        created_at = now - timedelta(days=age, seconds=rng.randrange(86400))
+        start_date: Optional[datetime] = None
+        deadline: Optional[datetime] = None
+
+        if rng.random() < 0.75:
+            start_date = created_at + timedelta(days=rng.randrange(15), hours=rng.randrange(8, 19))
+        if rng.random() < 0.55:
+            deadline = (start_date or created_at) + timedelta(days=rng.randrange(1, 61))
+
+        task = {
+            "title": f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} #{number}",
+            "description": " ".join(rng.sample(DETAILS, rng.randrange(1, 3))) if rng.random() < 0.4 else None,
+            "category": rng.choices(CATEGORY_NAMES, CATEGORY_WEIGHTS)[0],
+            "status": task_status(rng, int(age)),
+            "start_date": start_date,
+            "deadline": deadline,
+            "created_at": created_at,
+        }
+        # Sin usar el rng, para no cambiar los datos que ya generaba cada seed
+        task["completed_at"] = (
+            min(now, deadline or start_date or created_at + timedelta(days=1))
+            if task["status"] == "completado" else None
+        )
+        yield task